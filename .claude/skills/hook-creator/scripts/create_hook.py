@@ -11,12 +11,19 @@ Examples:
 """
 
 import argparse
+import json
 import os
+import re
 import sys
-import yaml
 from pathlib import Path
 from datetime import datetime
 
+# Keys the hand-written emitter can write unquoted
+PLAIN_KEY_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_-]*$')
+
+# Characters YAML reads as line breaks but json.dumps leaves unescaped
+YAML_BREAKS = str.maketrans({'\x85': '\\x85', '\u2028': '\\u2028', '\u2029': '\\u2029'})
+
 HOOK_TYPES = {
     'before': 'Before tool execution',
     'after': 'After tool execution',
@@ -99,31 +106,98 @@ def create_hook_config(name, event, tool=None, script_path=None, command=None,
 
     return config
 
-def update_hooks_yaml(config, hooks_file='.claude/hooks.yaml'):
-    """Update or create hooks.yaml file"""
+def load_yaml():
+    """Import PyYAML on demand, preferring the libyaml-backed loader/dumper"""
+    import yaml
+    try:
+        from yaml import CSafeLoader as Loader, CSafeDumper as Dumper
+    except ImportError:
+        from yaml import SafeLoader as Loader, SafeDumper as Dumper
+    return yaml, Loader, Dumper
+
+def yaml_scalar(value):
+    """Render a simple scalar as YAML, or None if it needs the full dumper"""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, str) and '\n' not in value:
+        # A JSON string is a valid double-quoted YAML scalar
+        return json.dumps(value, ensure_ascii=False).translate(YAML_BREAKS)
+    return None
+
+def render_hooks_yaml(hooks_config):
+    """Render a hooks document of flat hook entries, or None if unsupported"""
+    hooks = hooks_config.get('hooks')
+    if set(hooks_config) != {'hooks'} or not isinstance(hooks, list):
+        return None
+    if not hooks:
+        return 'hooks: []\n'
+
+    lines = ['hooks:']
+    for hook in hooks:
+        if not isinstance(hook, dict) or not hook:
+            return None
+        prefix = '- '
+        for key, value in hook.items():
+            if not isinstance(key, str) or not PLAIN_KEY_RE.match(key):
+                return None
+            if isinstance(value, dict):
+                if not value:
+                    return None
+                lines.append(f'{prefix}{key}:')
+                for sub_key, sub_value in value.items():
+                    if not isinstance(sub_key, str) or not PLAIN_KEY_RE.match(sub_key):
+                        return None
+                    rendered = yaml_scalar(sub_value)
+                    if rendered is None:
+                        return None
+                    lines.append(f'    {sub_key}: {rendered}')
+            else:
+                rendered = yaml_scalar(value)
+                if rendered is None:
+                    return None
+                lines.append(f'{prefix}{key}: {rendered}')
+            prefix = '  '
+    return '\n'.join(lines) + '\n'
+
+def update_hooks_yaml(configs, hooks_file='.claude/hooks.yaml'):
+    """Update or create hooks.yaml file with one or more hook configs"""
+    if isinstance(configs, dict):
+        configs = [configs]
+
     hooks_path = Path(hooks_file)
     hooks_path.parent.mkdir(exist_ok=True)
 
     # Load existing hooks if file exists
     if hooks_path.exists():
+        yaml, loader, _ = load_yaml()
         with open(hooks_path, 'r') as f:
-            hooks_config = yaml.safe_load(f) or {'hooks': []}
+            hooks_config = yaml.load(f, Loader=loader) or {'hooks': []}
     else:
         hooks_config = {'hooks': []}
 
-    # Check for existing hook with same name
-    for i, hook in enumerate(hooks_config['hooks']):
-        if hook['name'] == config['name']:
-            print(f"Updating existing hook: {config['name']}")
-            hooks_config['hooks'][i] = config
-            break
-    else:
-        print(f"Adding new hook: {config['name']}")
-        hooks_config['hooks'].append(config)
+    hooks = hooks_config['hooks']
+    index_by_name = {hook['name']: i for i, hook in enumerate(hooks)}
 
-    # Write updated config
+    for config in configs:
+        i = index_by_name.get(config['name'])
+        if i is not None:
+            print(f"Updating existing hook: {config['name']}")
+            hooks[i] = config
+        else:
+            print(f"Adding new hook: {config['name']}")
+            index_by_name[config['name']] = len(hooks)
+            hooks.append(config)
+
+    # Write updated config; multi-line or nested values need the full dumper
+    content = render_hooks_yaml(hooks_config)
     with open(hooks_path, 'w') as f:
-        yaml.dump(hooks_config, f, default_flow_style=False, indent=2)
+        if content is not None:
+            f.write(content)
+        else:
+            yaml, _, dumper = load_yaml()
+            yaml.dump(hooks_config, f, Dumper=dumper, default_flow_style=False, indent=2)
 
     print(f"✅ Hook configuration saved to {hooks_file}")
 
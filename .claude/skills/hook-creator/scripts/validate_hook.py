@@ -8,20 +8,49 @@ Usage:
 
 import argparse
 import os
+import re
+import stat
 import sys
 import yaml
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
-VALID_EVENTS = [
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+VALID_EVENTS = frozenset({
     'before', 'after', 'session_start', 'session_end',
     'slash_command', 'agent_created', 'agent_destroyed'
-]
+})
 
-VALID_TOOLS = [
+VALID_TOOLS = frozenset({
     'bash', 'write', 'read', 'edit', 'glob', 'grep', 'webfetch',
     'task', 'slashcommand', 'killshell', 'git', 'mcp'
-]
+})
+
+# Size format for the 'file_size' condition (e.g., "100KB", "1MB")
+SIZE_RE = re.compile(r'^\d+[KMGT]?B$', re.IGNORECASE)
+
+# Parsed hooks files: absolute path -> ((mtime_ns, size), config)
+PARSE_CACHE: Dict[str, tuple] = {}
+
+def load_hooks_config(hooks_file: str) -> Any:
+    """Parse a hooks file, reusing the previous parse while the file is unchanged"""
+    path = os.path.abspath(hooks_file)
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+
+    cached = PARSE_CACHE.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    with open(path, 'r') as f:
+        config = yaml.load(f, Loader=YamlLoader)
+    PARSE_CACHE[path] = (stamp, config)
+    return config
 
 class HookValidator:
     def __init__(self):
@@ -35,8 +64,7 @@ class HookValidator:
             return False
 
         try:
-            with open(hooks_file, 'r') as f:
-                config = yaml.safe_load(f)
+            config = load_hooks_config(hooks_file)
         except yaml.YAMLError as e:
             self.errors.append(f"Invalid YAML in {hooks_file}: {e}")
             return False
@@ -79,7 +107,9 @@ class HookValidator:
         if 'event' not in hook:
             self.errors.append(f"{path}: Missing required field 'event'")
         elif hook['event'] not in VALID_EVENTS:
-            self.errors.append(f"{path}: Invalid event '{hook['event']}'. Valid: {VALID_EVENTS}")
+            self.errors.append(
+                f"{path}: Invalid event '{hook['event']}'. Valid: {sorted(VALID_EVENTS)}"
+            )
 
         # Command/script validation
         if 'command' not in hook:
@@ -90,15 +120,22 @@ class HookValidator:
             else:
                 # Check if command is a file path
                 if hook['command'].startswith('./') or hook['command'].startswith('/'):
-                    if not os.path.exists(hook['command']):
+                    try:
+                        st = os.stat(hook['command'])
+                    except OSError:
                         self.errors.append(f"{path}: Command script not found: {hook['command']}")
-                    elif not os.access(hook['command'], os.X_OK):
-                        self.warnings.append(f"{path}: Command script not executable: {hook['command']}")
+                    else:
+                        if not st.st_mode & (stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH):
+                            self.warnings.append(
+                                f"{path}: Command script not executable: {hook['command']}"
+                            )
 
         # Optional field validation
         if 'tool' in hook:
             if hook['tool'] not in VALID_TOOLS:
-                self.errors.append(f"{path}: Invalid tool '{hook['tool']}'. Valid: {VALID_TOOLS}")
+                self.errors.append(
+                    f"{path}: Invalid tool '{hook['tool']}'. Valid: {sorted(VALID_TOOLS)}"
+                )
 
         if 'enabled' in hook and not isinstance(hook['enabled'], bool):
             self.errors.append(f"{path}: 'enabled' must be a boolean")
@@ -137,9 +174,7 @@ class HookValidator:
                 if not isinstance(value, str):
                     self.errors.append(f"{path}: 'file_size' must be a string")
                 else:
-                    # Validate size format (e.g., "100KB", "1MB")
-                    import re
-                    if not re.match(r'^\d+[KMGT]?B$', value, re.IGNORECASE):
+                    if not SIZE_RE.match(value):
                         self.errors.append(f"{path}: 'file_size' format invalid. Use: 100KB, 1MB, etc")
 
             else:
@@ -11,8 +11,9 @@ Examples:
     init_skill.py custom-skill --path /custom/location
 """
 
+import functools
+import os
 import sys
-from pathlib import Path
 
 SKILL_TEMPLATE = """---
 name: {skill_name}
@@ -184,12 +185,41 @@ Example asset files from other skills:
 Note: This is a text placeholder. Actual assets can be any file type.
 """
 
+# Resource directories created alongside SKILL.md
+RESOURCE_DIRS = ("scripts", "references", "assets")
+
+# Example resource files: (path relative to the skill directory, template, executable)
+EXAMPLE_FILES = (
+    ("scripts/example.py", EXAMPLE_SCRIPT, True),
+    ("references/api_reference.md", EXAMPLE_REFERENCE, False),
+    ("assets/example_asset.txt", EXAMPLE_ASSET, False),
+)
+
 
 def title_case_skill_name(skill_name):
     """Convert hyphenated skill name to Title Case for display."""
     return " ".join(word.capitalize() for word in skill_name.split("-"))
 
 
+@functools.lru_cache(maxsize=None)
+def render_skill_files(skill_name):
+    """
+    Render SKILL.md and the example resource files for a skill name.
+
+    Returns:
+        Tuple of (relative path, content, executable) entries, SKILL.md first
+    """
+    skill_title = title_case_skill_name(skill_name)
+    skill_md = SKILL_TEMPLATE.format(skill_name=skill_name, skill_title=skill_title)
+    files = [("SKILL.md", skill_md, False)]
+    for rel_path, template, executable in EXAMPLE_FILES:
+        # Templates without placeholders are written verbatim
+        if "{" in template:
+            template = template.format(skill_name=skill_name, skill_title=skill_title)
+        files.append((rel_path, template, executable))
+    return tuple(files)
+
+
 def init_skill(skill_name, path):
     """
     Initialize a new skill directory with template SKILL.md.
@@ -202,59 +232,35 @@ def init_skill(skill_name, path):
         Path to created skill directory, or None if error
     """
     # Determine skill directory path
-    skill_dir = Path(path).resolve() / skill_name
+    skill_dir = os.path.join(os.path.abspath(path), skill_name)
 
     # Check if directory already exists
-    if skill_dir.exists():
+    if os.path.exists(skill_dir):
         print(f"❌ Error: Skill directory already exists: {skill_dir}")
         return None
 
-    # Create skill directory
+    # Create skill directory and all resource directories up front, in one pass
     try:
-        skill_dir.mkdir(parents=True, exist_ok=False)
+        os.makedirs(skill_dir)
+        for resource_dir in RESOURCE_DIRS:
+            os.mkdir(os.path.join(skill_dir, resource_dir))
         print(f"✅ Created skill directory: {skill_dir}")
     except Exception as e:
         print(f"❌ Error creating directory: {e}")
         return None
 
-    # Create SKILL.md from template
-    skill_title = title_case_skill_name(skill_name)
-    skill_content = SKILL_TEMPLATE.format(skill_name=skill_name, skill_title=skill_title)
-
-    skill_md_path = skill_dir / "SKILL.md"
-    try:
-        skill_md_path.write_text(skill_content)
-        print("✅ Created SKILL.md")
-    except Exception as e:
-        print(f"❌ Error creating SKILL.md: {e}")
-        return None
-
-    # Create resource directories with example files
-    try:
-        # Create scripts/ directory with example script
-        scripts_dir = skill_dir / "scripts"
-        scripts_dir.mkdir(exist_ok=True)
-        example_script = scripts_dir / "example.py"
-        example_script.write_text(EXAMPLE_SCRIPT.format(skill_name=skill_name))
-        example_script.chmod(0o755)
-        print("✅ Created scripts/example.py")
-
-        # Create references/ directory with example reference doc
-        references_dir = skill_dir / "references"
-        references_dir.mkdir(exist_ok=True)
-        example_reference = references_dir / "api_reference.md"
-        example_reference.write_text(EXAMPLE_REFERENCE.format(skill_title=skill_title))
-        print("✅ Created references/api_reference.md")
-
-        # Create assets/ directory with example asset placeholder
-        assets_dir = skill_dir / "assets"
-        assets_dir.mkdir(exist_ok=True)
-        example_asset = assets_dir / "example_asset.txt"
-        example_asset.write_text(EXAMPLE_ASSET)
-        print("✅ Created assets/example_asset.txt")
-    except Exception as e:
-        print(f"❌ Error creating resource directories: {e}")
-        return None
+    # Write SKILL.md and the example resource files
+    for rel_path, content, executable in render_skill_files(skill_name):
+        file_path = os.path.join(skill_dir, rel_path)
+        try:
+            with open(file_path, "w") as f:
+                f.write(content)
+            if executable:
+                os.chmod(file_path, 0o755)
+            print(f"✅ Created {rel_path}")
+        except Exception as e:
+            print(f"❌ Error creating {rel_path}: {e}")
+            return None
 
     # Print next steps
     print(f"\n✅ Skill '{skill_name}' initialized successfully at {skill_dir}")
@@ -10,12 +10,59 @@ Example:
     python utils/package_skill.py skills/public/my-skill ./dist
 """
 
+import os
+import shutil
 import sys
 import zipfile
 from pathlib import Path
 
 from quick_validate import validate_skill
 
+# Directories and files never included in a packaged skill
+EXCLUDED_DIRS = {".git", "__pycache__"}
+EXCLUDED_FILES = {".DS_Store", "Thumbs.db"}
+EXCLUDED_SUFFIXES = (".pyc", ".pyo")
+
+# Buffer size used when streaming files into the archive
+COPY_BUFFER_SIZE = 1 << 20
+
+# Files smaller than this are stored uncompressed; deflate gains little on them
+STORE_THRESHOLD = 4096
+
+# Fast deflate level for larger files; skill bundles are mostly small text
+COMPRESS_LEVEL = 1
+
+
+def iter_skill_files(root):
+    """
+    Yield the paths of all files under root, skipping excluded entries.
+
+    Uses a single os.scandir walk so each directory is listed exactly once.
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in EXCLUDED_DIRS:
+                        stack.append(entry.path)
+                elif entry.is_file():
+                    name = entry.name
+                    if name not in EXCLUDED_FILES and not name.endswith(EXCLUDED_SUFFIXES):
+                        yield entry.path
+
+
+def add_file_to_zip(zipf, file_path, arcname):
+    """Stream a file into the archive with a large copy buffer."""
+    zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+    if zinfo.file_size < STORE_THRESHOLD:
+        zinfo.compress_type = zipfile.ZIP_STORED
+    else:
+        zinfo.compress_type = zipf.compression
+        zinfo.compress_level = zipf.compresslevel
+    with open(file_path, "rb") as src, zipf.open(zinfo, "w") as dst:
+        shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+
 
 def package_skill(skill_path, output_dir=None):
     """
@@ -39,13 +86,7 @@ def package_skill(skill_path, output_dir=None):
         print(f"❌ Error: Path is not a directory: {skill_path}")
         return None
 
-    # Validate SKILL.md exists
-    skill_md = skill_path / "SKILL.md"
-    if not skill_md.exists():
-        print(f"❌ Error: SKILL.md not found in {skill_path}")
-        return None
-
-    # Run validation before packaging
+    # Run validation before packaging (also reports a missing SKILL.md)
     print("🔍 Validating skill...")
     valid, message = validate_skill(skill_path)
     if not valid:
@@ -66,14 +107,16 @@ def package_skill(skill_path, output_dir=None):
 
     # Create the .skill file (zip format)
     try:
-        with zipfile.ZipFile(skill_filename, "w", zipfile.ZIP_DEFLATED) as zipf:
+        with zipfile.ZipFile(
+            skill_filename, "w", zipfile.ZIP_DEFLATED, compresslevel=COMPRESS_LEVEL
+        ) as zipf:
             # Walk through the skill directory
-            for file_path in skill_path.rglob("*"):
-                if file_path.is_file():
-                    # Calculate the relative path within the zip
-                    arcname = file_path.relative_to(skill_path.parent)
-                    zipf.write(file_path, arcname)
-                    print(f"  Added: {arcname}")
+            base_dir = os.fspath(skill_path.parent)
+            for file_path in sorted(iter_skill_files(skill_path)):
+                # Calculate the relative path within the zip
+                arcname = os.path.relpath(file_path, base_dir)
+                add_file_to_zip(zipf, file_path, arcname)
+                print(f"  Added: {arcname}")
 
         print(f"\n✅ Successfully packaged skill to: {skill_filename}")
         return skill_filename
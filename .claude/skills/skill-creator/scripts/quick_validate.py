@@ -10,23 +10,26 @@ from pathlib import Path
 
 import yaml
 
+FRONTMATTER_RE = re.compile(r"^---\n(.*?)\n---", re.DOTALL)
+SKILL_NAME_RE = re.compile(r"^[a-z0-9-]+$")
+
 
 def validate_skill(skill_path):
     """Basic validation of a skill"""
     skill_path = Path(skill_path)
 
-    # Check SKILL.md exists
+    # Read SKILL.md and validate frontmatter
     skill_md = skill_path / "SKILL.md"
-    if not skill_md.exists():
+    try:
+        content = skill_md.read_text()
+    except (FileNotFoundError, IsADirectoryError):
         return False, "SKILL.md not found"
 
-    # Read and validate frontmatter
-    content = skill_md.read_text()
     if not content.startswith("---"):
         return False, "No YAML frontmatter found"
 
     # Extract frontmatter
-    match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
+    match = FRONTMATTER_RE.match(content)
     if not match:
         return False, "Invalid frontmatter format"
 
@@ -64,7 +67,7 @@ def validate_skill(skill_path):
     name = name.strip()
     if name:
         # Check naming convention (hyphen-case: lowercase with hyphens)
-        if not re.match(r"^[a-z0-9-]+$", name):
+        if not SKILL_NAME_RE.match(name):
             return (
                 False,
                 f"Name '{name}' should be hyphen-case (lowercase letters, digits, and hyphens only)",
@@ -1,13 +1,14 @@
 """Core clipboard management logic."""
 import os
 import time
-from typing import List, Optional, Callable
+from typing import List, Optional, Callable, Tuple
 from collections import deque
 from pathlib import Path
 import threading
+import queue
 
 from interfaces import ClipboardData, ClipboardType, DeviceInfo
-from platforms.clipboard_monitor import CrossPlatformClipboardMonitor
+from platforms.clipboard_monitor import CrossPlatformClipboardMonitor, clipboard_checksum
 from platforms.network import UDPClipboardNetwork
 
 class ClipboardManager:
@@ -22,12 +23,25 @@ class ClipboardManager:
         self.clipboard_monitor = CrossPlatformClipboardMonitor()
         self.network = UDPClipboardNetwork(port=udp_port)
 
-        # History storage
-        self.history = deque(maxlen=max_history)
+        # History storage, one bounded column per ClipboardData field
+        self._history_contents = deque(maxlen=max_history)
+        self._history_types = deque(maxlen=max_history)
+        self._history_timestamps = deque(maxlen=max_history)
+        self._history_devices = deque(maxlen=max_history)
         self._lock = threading.Lock()
+        self._history_generation = 0  # Bumped by clear_history to void pending image writes
 
-        # Device event callbacks
-        self._device_callbacks: List[Callable[[str, DeviceInfo], None]] = []
+        # Checksums of recent local changes, used to drop echoes from other devices
+        self._recent_hashes = deque(maxlen=16)
+
+        # Image files are written by a background thread so callbacks never block on disk
+        self._write_queue: queue.Queue = queue.Queue(maxsize=64)
+        self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer_thread.start()
+
+        # Device event callbacks; replaced (never mutated) so dispatch needs no lock
+        self._device_callbacks: Tuple[Callable[[str, DeviceInfo], None], ...] = ()
+        self._history_callbacks: Tuple[Callable[[], None], ...] = ()
 
         # Setup callbacks
         self.clipboard_monitor.start_monitoring(self._on_local_clipboard_change)
@@ -36,43 +50,105 @@ class ClipboardManager:
 
     def _on_local_clipboard_change(self, data: ClipboardData):
         """Handle local clipboard changes."""
+        self._recent_hashes.append(clipboard_checksum(data))
+
+        # Only the history mutation needs the lock
         with self._lock:
-            # Add to history
-            self.history.append(data)
+            self._append_history(data)
 
             # Save image data if needed
             if data.type == ClipboardType.IMAGE:
                 self._save_image_data(data)
+        self._on_history_changed()
 
-            # Broadcast to network
-            self.network.broadcast_clipboard(data)
+        # Broadcast to network
+        self.network.broadcast_clipboard(data)
 
     def _on_network_clipboard_receive(self, data: ClipboardData):
         """Handle clipboard data from network."""
+        # Skip content this device just broadcast itself
+        if clipboard_checksum(data) in self._recent_hashes:
+            return
+
+        # Add to history but don't broadcast back
         with self._lock:
-            # Add to history but don't broadcast back
-            self.history.append(data)
+            self._append_history(data)
 
             # Save image data if needed
             if data.type == ClipboardType.IMAGE:
                 self._save_image_data(data)
+        self._on_history_changed()
 
     def _save_image_data(self, data: ClipboardData):
-        """Save image data to file."""
-        if data.type == ClipboardType.IMAGE:
-            filename = f"{data.device_name}_{int(data.timestamp)}.png"
-            filepath = self.data_dir / filename
+        """Queue image data to be saved to file. Caller must hold the lock."""
+        filename = f"{data.device_name}_{int(data.timestamp)}.png"
+        filepath = self.data_dir / filename
+
+        # History keeps the bytes until the writer swaps in the finished file's path
+        try:
+            self._write_queue.put_nowait((str(filepath), data.content, self._history_generation))
+        except queue.Full:
+            print(f"Image write queue full, keeping {filename} in memory only")
+
+    def _writer_loop(self):
+        """Write queued image files until a None sentinel is received."""
+        while True:
+            item = self._write_queue.get()
+            if item is None:
+                break
+
+            filepath, content, generation = item
+            if generation != self._history_generation:
+                continue  # History was cleared while this write was pending
 
-            with open(filepath, 'wb') as f:
-                f.write(data.content)
-
-            # Store filepath in content for easier access
-            data.content = str(filepath)
+            try:
+                flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+                fd = os.open(filepath, flags, 0o644)
+                try:
+                    view = memoryview(content)
+                    while view:
+                        view = view[os.write(fd, view):]
+                finally:
+                    os.close(fd)
+            except Exception as e:
+                print(f"Error saving image {filepath}: {e}")
+                continue
+
+            # Publish the path only now that the file exists
+            published = False
+            with self._lock:
+                if generation == self._history_generation:
+                    for index, existing in enumerate(self._history_contents):
+                        if existing is content:
+                            self._history_contents[index] = filepath
+                            published = True
+                            break
+                else:
+                    try:
+                        os.unlink(filepath)  # Cleared mid-write; don't resurrect the file
+                    except OSError:
+                        pass
+
+            if published:
+                self._on_history_changed()
+
+    def _append_history(self, data: ClipboardData):
+        """Append an entry to the history columns. Caller must hold the lock."""
+        self._history_contents.append(data.content)
+        self._history_types.append(data.type)
+        self._history_timestamps.append(data.timestamp)
+        self._history_devices.append(data.device_name)
 
     def get_history(self) -> List[ClipboardData]:
         """Get clipboard history."""
         with self._lock:
-            return list(self.history)
+            return [
+                ClipboardData(content, data_type, timestamp, device_name)
+                for content, data_type, timestamp, device_name in zip(
+                    self._history_contents, self._history_types,
+                    self._history_timestamps, self._history_devices
+                )
+            ]
 
     def copy_to_clipboard(self, data: ClipboardData) -> bool:
         """Copy data to local clipboard."""
@@ -81,26 +157,36 @@ class ClipboardManager:
     def clear_history(self) -> None:
         """Clear all clipboard history and remove saved image files."""
         with self._lock:
-            # Clear in-memory history
-            self.history.clear()
+            # Clear in-memory history; pending image writes are discarded
+            self._history_generation += 1
+            self._history_contents.clear()
+            self._history_types.clear()
+            self._history_timestamps.clear()
+            self._history_devices.clear()
 
             # Remove saved image files
             try:
-                if self.data_dir.exists():
-                    for file_path in self.data_dir.glob("*.png"):
+                with os.scandir(self.data_dir) as entries:
+                    for entry in entries:
+                        if not entry.name.endswith(".png"):
+                            continue
                         try:
-                            file_path.unlink()
+                            os.unlink(entry.path)
                         except Exception as e:
-                            print(f"Error removing file {file_path}: {e}")
+                            print(f"Error removing file {entry.path}: {e}")
+            except FileNotFoundError:
+                pass  # Nothing saved yet
             except Exception as e:
                 print(f"Error clearing history directory: {e}")
 
             print("Clipboard history cleared")
 
+        self._on_history_changed()
+
     def get_history_count(self) -> int:
         """Get the number of items in history."""
         with self._lock:
-            return len(self.history)
+            return len(self._history_timestamps)
 
     def _on_device_event(self, event_type: str, device: DeviceInfo):
         """Handle device events (join/leave)."""
@@ -112,7 +198,19 @@ class ClipboardManager:
 
     def add_device_callback(self, callback: Callable[[str, DeviceInfo], None]):
         """Add a callback for device events."""
-        self._device_callbacks.append(callback)
+        self._device_callbacks = self._device_callbacks + (callback,)
+
+    def _on_history_changed(self):
+        """Notify history listeners. Called without the lock held."""
+        for callback in self._history_callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in history callback: {e}")
+
+    def add_history_callback(self, callback: Callable[[], None]):
+        """Add a callback invoked whenever the history changes."""
+        self._history_callbacks = self._history_callbacks + (callback,)
 
     def get_connected_devices(self) -> List[DeviceInfo]:
         """Get list of connected devices."""
@@ -125,4 +223,8 @@ class ClipboardManager:
     def shutdown(self):
         """Shutdown the clipboard manager."""
         self.clipboard_monitor.stop_monitoring()
-        self.network.stop_listening()
\ No newline at end of file
+        self.network.stop_listening()
+
+        # Flush pending image writes
+        self._write_queue.put(None)
+        self._writer_thread.join(timeout=5)
\ No newline at end of file
@@ -8,21 +8,22 @@ class ClipboardType(Enum):
     TEXT = "text"
     IMAGE = "image"
 
-@dataclass
+@dataclass(slots=True)
 class ClipboardData:
     content: Any
     type: ClipboardType
     timestamp: float
     device_name: str
 
-@dataclass
+@dataclass(slots=True)
 class DeviceInfo:
     name: str
     ip_address: str
     last_seen: float
     platform: str = "Unknown"
+    websocket_port: Optional[int] = None
 
-@dataclass
+@dataclass(slots=True)
 class NetworkPacket:
     packet_type: str  # "device_announce", "device_discovery", "clipboard_data", "device_heartbeat"
     sender_name: str
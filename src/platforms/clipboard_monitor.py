@@ -3,15 +3,69 @@ import time
 import platform
 import socket
 import threading
-from typing import Optional, Callable
+from typing import Optional, Callable, Tuple
 import pyperclip
-from PIL import ImageGrab
+from PIL import Image, ImageGrab
 import io
 import base64
-import hashlib
+import zlib
 
 from interfaces import ClipboardMonitorInterface, ClipboardData, ClipboardType
 
+# Payloads above this size are checksummed from their head and tail only
+LARGE_PAYLOAD_THRESHOLD = 1_000_000
+SAMPLE_SIZE = 4096
+
+def clipboard_checksum(data: ClipboardData) -> int:
+    """Cheap change-detection checksum of clipboard content (CRC32 + length)."""
+    content = data.content.encode() if data.type == ClipboardType.TEXT else data.content
+    if len(content) > LARGE_PAYLOAD_THRESHOLD:
+        view = memoryview(content)
+        crc = zlib.crc32(view[-SAMPLE_SIZE:], zlib.crc32(view[:SAMPLE_SIZE]))
+        return (len(content) << 32) | crc
+    return (len(content) << 32) | zlib.crc32(content)
+
+def _native_change_counter() -> Optional[Callable[[], int]]:
+    """Return a callable giving the OS clipboard change count, if the platform has one."""
+    system = platform.system()
+    try:
+        if system == "Windows":
+            import ctypes
+            return ctypes.windll.user32.GetClipboardSequenceNumber
+        if system == "Darwin":
+            from AppKit import NSPasteboard  # Only present when pyobjc is installed
+            return NSPasteboard.generalPasteboard().changeCount
+    except Exception:
+        pass
+    return None
+
+def _native_paste() -> Callable[[], Optional[str]]:
+    """Return a callable reading clipboard text natively, falling back to pyperclip."""
+    system = platform.system()
+    try:
+        if system == "Darwin":
+            from AppKit import NSPasteboard, NSPasteboardTypeString
+            pasteboard = NSPasteboard.generalPasteboard()
+            return lambda: pasteboard.stringForType_(NSPasteboardTypeString)
+        if system == "Windows":
+            import win32clipboard  # Only present when pywin32 is installed
+            lock = threading.Lock()
+
+            def paste() -> Optional[str]:
+                with lock:
+                    win32clipboard.OpenClipboard()
+                    try:
+                        text_format = win32clipboard.CF_UNICODETEXT
+                        if not win32clipboard.IsClipboardFormatAvailable(text_format):
+                            return None
+                        return win32clipboard.GetClipboardData(text_format)
+                    finally:
+                        win32clipboard.CloseClipboard()
+            return paste
+    except Exception:
+        pass
+    return pyperclip.paste
+
 class CrossPlatformClipboardMonitor(ClipboardMonitorInterface):
     """Cross-platform clipboard monitor using pyperclip and PIL."""
 
@@ -21,39 +75,66 @@ class CrossPlatformClipboardMonitor(ClipboardMonitorInterface):
         self._monitor_thread = None
         self._callback = None
         self._last_hash = None
+        self._png_cache = None  # (raw image key, encoded PNG bytes)
+        self._stop_event = threading.Event()
+
+        # OS change counter lets idle ticks skip reading the clipboard entirely
+        self._change_counter = _native_change_counter()
+        self._last_change_count = None
+
+        # ImageGrab only reads the clipboard on Windows/macOS; resolve that once
+        if platform.system() in ("Windows", "Darwin"):
+            self._grab_image = ImageGrab.grabclipboard
+        else:
+            self._grab_image = lambda: None
+
+        # Read text through the native pasteboard when available instead of pbpaste/xclip
+        self._paste = _native_paste()
 
     def get_clipboard_data(self) -> Optional[ClipboardData]:
         """Get current clipboard data."""
         try:
-            # Try to get image first
-            if platform.system() in ["Windows", "Darwin"]:
-                image = ImageGrab.grabclipboard()
-                if image and isinstance(image, Image.Image):
-                    # Convert image to bytes
-                    img_bytes = io.BytesIO()
-                    image.save(img_bytes, format='PNG')
-                    img_bytes.seek(0)
-                    return ClipboardData(
-                        content=img_bytes.read(),
-                        type=ClipboardType.IMAGE,
-                        timestamp=time.time(),
-                        device_name=self.device_name
-                    )
-
-            # Try to get text
-            text = pyperclip.paste()
-            if text and text.strip():
-                return ClipboardData(
-                    content=text,
-                    type=ClipboardType.TEXT,
-                    timestamp=time.time(),
-                    device_name=self.device_name
-                )
+            return self._read_clipboard()
         except Exception as e:
             print(f"Error getting clipboard data: {e}")
+            return None
+
+    def _read_clipboard(self) -> Optional[ClipboardData]:
+        """Read the clipboard; None means it is empty, a failed read raises."""
+        # Try to get image first
+        image = self._grab_image()
+        if image and isinstance(image, Image.Image):
+            return ClipboardData(
+                content=self._encode_png(image),
+                type=ClipboardType.IMAGE,
+                timestamp=time.time(),
+                device_name=self.device_name
+            )
+
+        # Try to get text
+        text = self._paste()
+        if text and text.strip():
+            return ClipboardData(
+                content=text,
+                type=ClipboardType.TEXT,
+                timestamp=time.time(),
+                device_name=self.device_name
+            )
 
         return None
 
+    def _encode_png(self, image: "Image.Image") -> bytes:
+        """Encode image as PNG, reusing the last encoding if the pixels are unchanged."""
+        raw_key = (image.size, image.mode, zlib.crc32(image.tobytes()))
+        if self._png_cache and self._png_cache[0] == raw_key:
+            return self._png_cache[1]
+
+        img_bytes = io.BytesIO()
+        image.save(img_bytes, format='PNG', optimize=False, compress_level=1)
+        png_bytes = img_bytes.getvalue()
+        self._png_cache = (raw_key, png_bytes)
+        return png_bytes
+
     def set_clipboard_data(self, data: ClipboardData) -> bool:
         """Set clipboard data."""
         try:
@@ -69,32 +150,47 @@ class CrossPlatformClipboardMonitor(ClipboardMonitorInterface):
             print(f"Error setting clipboard data: {e}")
             return False
 
-    def _get_clipboard_hash(self) -> Optional[str]:
-        """Get hash of current clipboard content for change detection."""
-        data = self.get_clipboard_data()
+    def _snapshot_clipboard(self) -> Tuple[Optional[ClipboardData], Optional[int]]:
+        """Read the clipboard once, returning the data and its checksum."""
+        data = self._read_clipboard()
         if not data:
-            return None
+            return None, None
 
-        if data.type == ClipboardType.TEXT:
-            return hashlib.md5(data.content.encode()).hexdigest()
-        else:
-            return hashlib.md5(data.content).hexdigest()
+        return data, clipboard_checksum(data)
+
+    def _clipboard_changed(self) -> bool:
+        """Cheap pre-check against the OS change counter, when available."""
+        if self._change_counter is None:
+            return True
+
+        count = self._change_counter()
+        if count == self._last_change_count:
+            return False
+        self._last_change_count = count
+        return True
 
     def _monitor_loop(self):
         """Main monitoring loop."""
         while self._monitoring:
             try:
-                current_hash = self._get_clipboard_hash()
-                if current_hash and current_hash != self._last_hash:
-                    self._last_hash = current_hash
-                    data = self.get_clipboard_data()
-                    if data and self._callback:
-                        self._callback(data)
-
-                time.sleep(0.5)  # Check every 500ms
+                self._poll()
+                self._stop_event.wait(0.5)  # Check every 500ms
             except Exception as e:
                 print(f"Error in monitoring loop: {e}")
-                time.sleep(1)
+                self._last_change_count = None  # Failed read (e.g. busy); retry next tick
+                self._stop_event.wait(1)
+
+    def _poll(self):
+        """Report the clipboard if it changed since the last poll."""
+        if not self._clipboard_changed():
+            return
+
+        # An empty clipboard keeps the change count; a failed read raises to _monitor_loop
+        data, current_hash = self._snapshot_clipboard()
+        if current_hash and current_hash != self._last_hash:
+            self._last_hash = current_hash
+            if self._callback:
+                self._callback(data)
 
     def start_monitoring(self, callback: Callable[[ClipboardData], None]) -> None:
         """Start monitoring clipboard changes."""
@@ -103,7 +199,11 @@ class CrossPlatformClipboardMonitor(ClipboardMonitorInterface):
 
         self._callback = callback
         self._monitoring = True
-        self._last_hash = self._get_clipboard_hash()
+        self._stop_event.clear()
+        try:
+            _, self._last_hash = self._snapshot_clipboard()
+        except Exception as e:
+            print(f"Error getting clipboard data: {e}")
 
         self._monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
         self._monitor_thread.start()
@@ -111,5 +211,6 @@ class CrossPlatformClipboardMonitor(ClipboardMonitorInterface):
     def stop_monitoring(self) -> None:
         """Stop monitoring clipboard changes."""
         self._monitoring = False
+        self._stop_event.set()
         if self._monitor_thread:
             self._monitor_thread.join(timeout=1)
\ No newline at end of file
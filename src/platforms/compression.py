@@ -0,0 +1,42 @@
+"""Payload compression shared by the network backends."""
+import zlib
+from typing import Optional, Tuple
+
+try:
+    import zstandard  # Optional, faster than zlib at a similar ratio
+except ImportError:
+    zstandard = None
+
+ENCODINGS = (None, 'zlib', 'zstd')  # Indexed by the encoding byte of binary frames
+DEFAULT_ENCODING = 'zstd' if zstandard else 'zlib'
+
+COMPRESS_THRESHOLD = 64 * 1024  # Compress payloads larger than this
+
+def compress_payload(payload: bytes,
+                     encoding: str = DEFAULT_ENCODING) -> Tuple[Optional[str], bytes]:
+    """Compress a large payload at level 1, returning the encoding used (None if sent raw)."""
+    if len(payload) <= COMPRESS_THRESHOLD:
+        return None, payload
+
+    if encoding == 'zstd':
+        # zstd compressor objects are not safe for concurrent use, so each call makes its own
+        compressed = zstandard.ZstdCompressor(level=1).compress(payload)
+    else:
+        compressed = zlib.compress(payload, 1)
+
+    # Already-compressed formats (PNG, JPEG) stay as they are
+    if len(compressed) < len(payload):
+        return encoding, compressed
+    return None, payload
+
+def decompress_payload(encoding: Optional[str], payload: bytes) -> bytes:
+    """Undo compress_payload for the encoding named by the sender."""
+    if encoding is None:
+        return payload
+    if encoding == 'zstd':
+        if not zstandard:
+            raise ValueError("zstd payload received but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    if encoding == 'zlib':
+        return zlib.decompress(payload)
+    raise ValueError(f"Unknown payload encoding {encoding!r}")
@@ -1,10 +1,13 @@
 """Device discovery mechanism for WebSocket connections."""
 import socket
+import selectors
 import threading
 import time
 import json
 from typing import Callable, Dict, List, Optional
 from interfaces import DeviceInfo
+from .local_ip import get_local_ip
+from .multicast import MULTICAST_GROUP, join_multicast_group, enable_multicast_send
 
 class WebSocketDeviceDiscovery:
     """Device discovery for WebSocket-based clipboard sharing."""
@@ -12,19 +15,24 @@ class WebSocketDeviceDiscovery:
     def __init__(self, websocket_port: int = 8765):
         self.websocket_port = websocket_port
         self.device_name = socket.gethostname()
-        self.device_ip = self._get_local_ip()
+        self.device_ip = get_local_ip()
 
         # Discovery socket
         self.discovery_socket = None
         self.broadcast_socket = None
+        self.multicast = False
+        self.multicast_joined = False  # Our discovery socket receives the multicast group
         self.running = False
         self.thread = None
+        self.wakeup_recv = None  # Socket pair used to interrupt the loop's select()
+        self.wakeup_send = None
 
         # Callbacks
         self.device_callback: Optional[Callable[[str, DeviceInfo], None]] = None
 
         # Discovered devices
         self.discovered_devices: Dict[str, DeviceInfo] = {}
+        self.broadcast_peers = set()  # Peers that only receive broadcasts
         self.device_lock = threading.Lock()
 
         # Discovery intervals
@@ -32,21 +40,6 @@ class WebSocketDeviceDiscovery:
         self.cleanup_interval = 60   # Clean up every 60 seconds
         self.device_timeout = 120    # Remove devices after 2 minutes
 
-    def _get_local_ip(self) -> str:
-        """Get local IP address."""
-        try:
-            # Try to connect to an external address to find the local IP
-            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
-                s.connect(("8.8.8.8", 80))
-                return s.getsockname()[0]
-        except Exception:
-            # Fallback methods
-            try:
-                hostname = socket.gethostname()
-                return socket.gethostbyname(hostname)
-            except Exception:
-                return "127.0.0.1"
-
     def start_discovery(self, device_callback: Callable[[str, DeviceInfo], None]):
         """Start device discovery."""
         if self.running:
@@ -54,6 +47,7 @@ class WebSocketDeviceDiscovery:
 
         self.device_callback = device_callback
         self.running = True
+        self.wakeup_recv, self.wakeup_send = socket.socketpair()
 
         # Start discovery thread
         self.thread = threading.Thread(target=self._discovery_loop, daemon=True)
@@ -65,6 +59,14 @@ class WebSocketDeviceDiscovery:
         """Stop device discovery."""
         self.running = False
 
+        if self.wakeup_send:
+            try:
+                self.wakeup_send.send(b'\0')
+            except OSError:
+                pass
+            self.wakeup_send.close()
+            self.wakeup_send = None
+
         if self.discovery_socket:
             try:
                 self.discovery_socket.close()
@@ -84,16 +86,21 @@ class WebSocketDeviceDiscovery:
 
     def _discovery_loop(self):
         """Main discovery loop."""
+        selector = selectors.DefaultSelector()
         try:
             # Setup discovery socket (listening)
             self.discovery_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             self.discovery_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             self.discovery_socket.bind(('', 8766))  # Discovery port
-            self.discovery_socket.settimeout(2.0)
+            self.discovery_socket.setblocking(False)
+            self.multicast_joined = join_multicast_group(self.discovery_socket)
+            selector.register(self.discovery_socket, selectors.EVENT_READ)
+            selector.register(self.wakeup_recv, selectors.EVENT_READ)
 
             # Setup broadcast socket (sending)
             self.broadcast_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             self.broadcast_socket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+            self.multicast = enable_multicast_send(self.broadcast_socket)
 
             print(f"Discovery listening on port 8766")
 
@@ -104,26 +111,35 @@ class WebSocketDeviceDiscovery:
                 current_time = time.time()
 
                 # Announce ourselves periodically
-                if current_time - last_announce > self.announce_interval:
+                if current_time - last_announce >= self.announce_interval:
                     self._announce_device()
                     last_announce = current_time
 
                 # Clean up old devices periodically
-                if current_time - last_cleanup > self.cleanup_interval:
+                if current_time - last_cleanup >= self.cleanup_interval:
                     self._cleanup_devices()
                     last_cleanup = current_time
 
+                # Sleep until a message arrives, the next timer is due, or we are stopped
+                next_due = min(last_announce + self.announce_interval,
+                               last_cleanup + self.cleanup_interval)
+                if not selector.select(max(0.0, next_due - time.time())) or not self.running:
+                    continue
+
                 # Listen for discovery messages
                 try:
                     data, addr = self.discovery_socket.recvfrom(1024)
                     self._handle_discovery_message(data, addr)
-                except socket.timeout:
+                except BlockingIOError:
                     continue
                 except Exception as e:
                     print(f"Error in discovery loop: {e}")
 
         except Exception as e:
             print(f"Error setting up discovery: {e}")
+        finally:
+            selector.close()
+            self.wakeup_recv.close()
 
     def _announce_device(self):
         """Announce our device to the network."""
@@ -133,15 +149,23 @@ class WebSocketDeviceDiscovery:
                 'device_name': self.device_name,
                 'device_ip': self.device_ip,
                 'websocket_port': self.websocket_port,
+                'multicast': self.multicast_joined,
                 'timestamp': time.time()
             }
 
             message = json.dumps(announcement).encode('utf-8')
 
-            # Broadcast to discovery port
-            self.broadcast_socket.sendto(message, ('<broadcast>', 8766))
+            # A single multicast send reaches every peer in the group, unless we or a
+            # known peer cannot receive it; broadcasts reach both kinds of listener
+            if self.multicast and self.multicast_joined and not self.broadcast_peers:
+                try:
+                    self.broadcast_socket.sendto(message, (MULTICAST_GROUP, 8766))
+                    return
+                except OSError as e:
+                    print(f"Multicast announce failed, falling back to broadcast: {e}")
+                    self.multicast = False
 
-            # Also try specific broadcast addresses
+            # Broadcast to discovery port ('<broadcast>' is the same address)
             self.broadcast_socket.sendto(message, ('255.255.255.255', 8766))
 
             # Try network-specific broadcast
@@ -178,6 +202,10 @@ class WebSocketDeviceDiscovery:
                     is_new = device_id not in self.discovered_devices
 
                     self.discovered_devices[device_id] = device_info
+                    if message.get('multicast'):
+                        self.broadcast_peers.discard(device_id)
+                    else:
+                        self.broadcast_peers.add(device_id)
 
                     if is_new and self.device_callback:
                         self.device_callback('device_discovered', device_info)
@@ -194,6 +222,7 @@ class WebSocketDeviceDiscovery:
             for device_id, device in list(self.discovered_devices.items()):
                 if current_time - device.last_seen > self.device_timeout:
                     del self.discovered_devices[device_id]
+                    self.broadcast_peers.discard(device_id)
                     removed_devices.append(device)
 
         # Notify about removed devices
@@ -0,0 +1,63 @@
+"""Local IP address lookup shared by the network backends."""
+import socket
+import time
+
+try:
+    import psutil  # Enumerates interfaces when there is no default route
+except ImportError:
+    psutil = None
+
+LOCAL_IP_TTL = 30.0  # Seconds before the address is looked up again
+UNROUTABLE_PREFIXES = ("127.", "169.254.")  # Loopback and link-local (no DHCP lease)
+
+_local_ip_cache = (0.0, "")  # (monotonic time of lookup, address)
+
+def _interface_ip() -> str:
+    """Get the first routable IPv4 address of an interface that is up."""
+    stats = psutil.net_if_stats()
+    for name, addresses in psutil.net_if_addrs().items():
+        if name not in stats or not stats[name].isup:
+            continue
+        for address in addresses:
+            if (address.family == socket.AF_INET
+                    and not address.address.startswith(UNROUTABLE_PREFIXES)):
+                return address.address
+    return ""
+
+def _lookup_local_ip() -> str:
+    """Get local IP address."""
+    try:
+        # Connecting a UDP socket sends nothing but picks the default route's source address
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(("8.8.8.8", 80))
+            return s.getsockname()[0]
+    except Exception:
+        pass
+
+    # No default route: take the first routable interface (may be a virtual adapter)
+    if psutil:
+        try:
+            address = _interface_ip()
+            if address:
+                return address
+        except Exception:
+            pass
+
+    # Fallback methods
+    try:
+        hostname = socket.gethostname()
+        return socket.gethostbyname(hostname)
+    except Exception:
+        return "127.0.0.1"
+
+def get_local_ip() -> str:
+    """Get local IP address, reusing the last lookup for up to LOCAL_IP_TTL seconds."""
+    global _local_ip_cache
+    checked_at, address = _local_ip_cache
+    now = time.monotonic()
+    if address and now - checked_at < LOCAL_IP_TTL:
+        return address
+
+    address = _lookup_local_ip()
+    _local_ip_cache = (now, address)
+    return address
@@ -0,0 +1,29 @@
+"""UDP multicast helpers shared by the clipboard and discovery sockets."""
+import logging
+import socket
+import struct
+
+MULTICAST_GROUP = "239.255.42.99"  # Administratively scoped, local to the site
+MULTICAST_TTL = 1  # Never leave the local link
+
+logger = logging.getLogger(__name__)
+
+def join_multicast_group(sock: socket.socket) -> bool:
+    """Join the sync-clip group on a bound receive socket; False means broadcast only."""
+    try:
+        membership = struct.pack(
+            "4s4s", socket.inet_aton(MULTICAST_GROUP), socket.inet_aton("0.0.0.0")
+        )
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+        return True
+    except OSError as e:
+        logger.warning("Multicast join failed, relying on broadcast: %s", e)
+        return False
+
+def enable_multicast_send(sock: socket.socket) -> bool:
+    """Configure a send socket for link-local multicast."""
+    try:
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, MULTICAST_TTL)
+        return True
+    except OSError:
+        return False
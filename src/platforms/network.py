@@ -1,18 +1,71 @@
 """Enhanced network communication for clipboard sharing with device discovery."""
+import errno
 import socket
 import threading
 import json
+import logging
 import time
-import base64
+import hashlib
 import platform
+import selectors
+import struct
 import subprocess
-from typing import Callable, Dict, Any, List, Set
+from collections import deque
+from typing import Callable, Dict, Any, List, Optional, Set, Tuple, Union
 from datetime import datetime
 
 from interfaces import (
     NetworkInterface, ClipboardData, ClipboardType,
     DeviceInfo, NetworkPacket
 )
+from .local_ip import get_local_ip
+from .multicast import MULTICAST_GROUP, join_multicast_group, enable_multicast_send
+from .compression import ENCODINGS, COMPRESS_THRESHOLD, compress_payload, decompress_payload
+
+try:
+    from pybase64 import b64decode  # Optional SIMD codec, same API as base64
+except ImportError:
+    from base64 import b64decode
+
+try:
+    import orjson  # Optional C-accelerated codec, wire-compatible with json
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    _json_encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+
+    def _dumps(obj: Any) -> bytes:
+        return _json_encoder.encode(obj).encode('utf-8')
+
+    _loads = json.loads  # Accepts UTF-8 bytes directly
+
+# Binary frame: magic, kind, flags, reserved, metadata length, payload length.
+# Raw payload bytes (images) follow a small JSON metadata block instead of base64;
+# flags holds the payload's ENCODINGS index (0 for uncompressed).
+FRAME_MAGIC = b'SCLP'
+FRAME_HEADER = struct.Struct('!4sBBHII')
+FRAME_KIND_CLIPBOARD = 1
+FRAME_FIELDS = frozenset(('content', 'enc'))  # Carried by the frame, not its metadata
+
+# Fixed-layout control packets: type code (< 32, never a JSON or frame lead byte),
+# timestamp, IPv4 address, sender name, platform.
+CONTROL_FRAME = struct.Struct('!Bd4s64p16p')
+CONTROL_TYPES = {1: "device_announce", 2: "device_discovery", 3: "device_heartbeat"}
+CONTROL_CODES = {packet_type: code for code, packet_type in CONTROL_TYPES.items()}
+CONTROL_MULTICAST = 0x10  # Type code flag: the sender receives the multicast group
+OWN_CONTROL_ID = slice(9, 77)  # Address and name fields of a control frame
+
+CLIPBOARD_FIELDS = frozenset(('content', 'type', 'timestamp', 'device_name'))
+
+MAX_DATAGRAM_SIZE = 65507  # Largest IPv4 UDP payload
+RECV_BUFFER_SIZE = 1 << 20  # Absorbs bursts of image frames from several peers
+MAX_RECV_BATCH = 16  # Datagrams read per selector wakeup
+
+# Send errors meaning the destination has no route from this host, as opposed to
+# transient or per-packet failures that say nothing about the next send
+UNROUTABLE_ERRNOS = frozenset((errno.ENETUNREACH, errno.EHOSTUNREACH, errno.EADDRNOTAVAIL))
+
+logger = logging.getLogger(__name__)  # Per-packet errors; formatting is deferred
 
 class UDPClipboardNetwork(NetworkInterface):
     """Enhanced UDP-based network communication with device discovery."""
@@ -22,18 +75,24 @@ class UDPClipboardNetwork(NetworkInterface):
         self.port = port  # Will be updated to actual bound port
         self.broadcast_ports = broadcast_ports or [5555, 5556, 5557, 5558, 5559]  # Common ports to broadcast to
         self.device_name = socket.gethostname()
-        self.device_ip = self._get_local_ip()
+        self.device_ip = get_local_ip()
         self.platform = platform.system()
 
         # Network state
         self._listening = False
-        self._listen_thread = None
-        self._heartbeat_thread = None
-        self._cleanup_thread = None
+        self._listen_thread = None  # Also runs heartbeats and device cleanup
 
         # Sockets
         self._socket = None
         self._broadcast_socket = None
+        self._broadcast_lock = threading.Lock()
+        self._multicast = False  # Send to the multicast group instead of broadcasting
+        self._multicast_joined = False  # Our listener receives the multicast group
+        self._recv_buffer = bytearray(65536)  # Reused by every recvfrom_into
+        self._recv_view = memoryview(self._recv_buffer)
+        self._wakeup_recv = None  # Socket pair used to interrupt the listener's select()
+        self._wakeup_send = None
+        self._update_broadcast_targets()
 
         # Callbacks
         self._clipboard_callback = None
@@ -45,25 +104,70 @@ class UDPClipboardNetwork(NetworkInterface):
 
         # Device timeout (seconds)
         self._device_timeout = 60  # Remove devices after 60 seconds of no heartbeat (increased for stability)
+        self._heartbeat_interval = 15  # Send heartbeat every 15 seconds (reduced frequency)
+        self._cleanup_interval = 5  # Check every 5 seconds for stability (reduced frequency)
+
+        # Peers that only receive broadcasts (failed join or older build)
+        self._broadcast_peers: Set[str] = set()
 
         # Data deduplication
-        self._processed_clipboard_data: set[str] = set()
+        self._processed_clipboard_data: set[tuple] = set()
+        self._processed_clipboard_order: deque[tuple] = deque()  # Insertion order for FIFO eviction
         self._dedup_lock = threading.Lock()
 
-    def _get_local_ip(self) -> str:
-        """Get local IP address."""
+        self._build_control_packets()
+
+    def _build_control_packets(self) -> None:
+        """Prepare the per-type control packet templates for the current address."""
+        # Control packets only differ in their timestamp; keep one dict per type
+        self._control_templates: Dict[str, Dict[str, Any]] = {
+            packet_type: {
+                'packet_type': packet_type,
+                'sender_name': self.device_name,
+                'sender_ip': self.device_ip,
+                'timestamp': 0.0,
+                'data': data
+            }
+            for packet_type, data in (
+                ("device_announce", {'platform': self.platform, 'multicast': False}),
+                ("device_discovery", {'multicast': False}),
+                ("device_heartbeat", {'multicast': False}),
+            )
+        }
+        self._control_fields = self._pack_control_fields()
+
+        # Byte patterns identifying our own packets before they are decoded
+        self._own_json_id = _dumps(
+            {'sender_name': self.device_name, 'sender_ip': self.device_ip}
+        )[1:-1]
+        self._own_control_id = (
+            CONTROL_FRAME.pack(0, 0.0, *self._control_fields)[OWN_CONTROL_ID]
+            if self._control_fields else None
+        )
+
+    def _is_own_packet(self, nbytes: int) -> bool:
+        """Cheaply detect our own looped-back packet in the receive buffer."""
+        if nbytes and self._recv_buffer[0] < 32:
+            return self._recv_view[OWN_CONTROL_ID] == self._own_control_id
+
+        # JSON packets and frame metadata name the sender near the start
+        return self._recv_buffer.find(self._own_json_id, 0, min(nbytes, 512)) != -1
+
+    def _pack_control_fields(self) -> Optional[Tuple[bytes, bytes, bytes]]:
+        """Encode the static control frame fields, or None if they do not fit the layout."""
         try:
-            # Try to connect to an external address to find the local IP
-            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
-                s.connect(("8.8.8.8", 80))
-                return s.getsockname()[0]
-        except Exception:
-            # Fallback methods
-            try:
-                hostname = socket.gethostname()
-                return socket.gethostbyname(hostname)
-            except Exception:
-                return "127.0.0.1"
+            fields = (
+                socket.inet_aton(self.device_ip),
+                self.device_name.encode('utf-8'),
+                self.platform.encode('utf-8')
+            )
+        except (OSError, UnicodeError):
+            return None
+
+        # 'p' fields silently truncate; long names keep using JSON so they round-trip
+        if len(fields[1]) > 63 or len(fields[2]) > 15:
+            return None
+        return fields
 
     def _serialize_packet(self, packet: NetworkPacket) -> bytes:
         """Serialize network packet for transmission."""
@@ -74,12 +178,58 @@ class UDPClipboardNetwork(NetworkInterface):
             'timestamp': packet.timestamp,
             'data': packet.data
         }
-        return json.dumps(data).encode('utf-8')
 
-    def _deserialize_packet(self, data: bytes) -> NetworkPacket:
-        """Deserialize network packet from transmission."""
+        content = packet.data.get('content') if isinstance(packet.data, dict) else None
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            data['data'] = {
+                key: value for key, value in packet.data.items() if key not in FRAME_FIELDS
+            }
+            meta = _dumps(data)
+            flags = ENCODINGS.index(packet.data.get('enc'))  # Payload codec, 0 for raw
+            header = FRAME_HEADER.pack(
+                FRAME_MAGIC, FRAME_KIND_CLIPBOARD, flags, 0, len(meta), len(content)
+            )
+            return b''.join((header, meta, content))
+
+        return _dumps(data)
+
+    def _unpack_frame(self, data: Union[bytes, memoryview]) -> Dict[str, Any]:
+        """Split a binary frame into its packet dict, restoring the raw payload as content."""
+        _, kind, flags, _, meta_len, payload_len = FRAME_HEADER.unpack_from(data)
+        if kind != FRAME_KIND_CLIPBOARD:
+            raise ValueError(f"Unknown frame kind {kind}")
+
+        start = FRAME_HEADER.size
+        packet_data = _loads(bytes(data[start:start + meta_len]))
+        payload = bytes(data[start + meta_len:start + meta_len + payload_len])
+        if len(payload) != payload_len:
+            raise ValueError("Truncated frame")
+
+        packet_data['data']['content'] = payload
+        if flags:
+            packet_data['data']['enc'] = ENCODINGS[flags]
+        return packet_data
+
+    def _deserialize_packet(self, data: Union[bytes, memoryview]) -> NetworkPacket:
+        """Deserialize network packet; views into the receive buffer are copied only where kept."""
         try:
-            packet_data = json.loads(data.decode('utf-8'))
+            if data and data[0] < 32:
+                code, timestamp, ip, name, system = CONTROL_FRAME.unpack_from(data)
+                return NetworkPacket(
+                    packet_type=CONTROL_TYPES[code & ~CONTROL_MULTICAST],
+                    sender_name=name.decode('utf-8'),
+                    sender_ip=socket.inet_ntoa(ip),
+                    timestamp=timestamp,
+                    data={
+                        'platform': system.decode('utf-8'),
+                        'multicast': bool(code & CONTROL_MULTICAST)
+                    }
+                )
+
+            if data[:4] == FRAME_MAGIC:
+                packet_data = self._unpack_frame(data)
+            else:
+                packet_data = _loads(bytes(data))
             return NetworkPacket(
                 packet_type=packet_data['packet_type'],
                 sender_name=packet_data['sender_name'],
@@ -88,7 +238,7 @@ class UDPClipboardNetwork(NetworkInterface):
                 data=packet_data.get('data')
             )
         except Exception as e:
-            print(f"Error deserializing packet: {e}")
+            logger.warning("Error deserializing packet: %s", e)
             return None
 
     def _serialize_clipboard_data(self, data: ClipboardData) -> Dict[str, Any]:
@@ -99,23 +249,27 @@ class UDPClipboardNetwork(NetworkInterface):
             'device_name': data.device_name
         }
 
-        if data.type == ClipboardType.TEXT:
-            packet_data['content'] = data.content
-        elif data.type == ClipboardType.IMAGE:
-            # Encode image as base64
-            packet_data['content'] = base64.b64encode(data.content).decode('utf-8')
-
+        content = data.content
+        if len(content) > COMPRESS_THRESHOLD:
+            # Large payloads go out compressed as raw bytes; 'enc' names the codec
+            raw = content.encode('utf-8') if data.type == ClipboardType.TEXT else content
+            encoding, compressed = compress_payload(raw)
+            if encoding:
+                packet_data['enc'] = encoding
+                content = compressed
+
+        # Bytes (images, compressed text); _serialize_packet sends them in a binary frame
+        packet_data['content'] = content
         return packet_data
 
     def _deserialize_clipboard_data(self, packet_data: Dict[str, Any]) -> ClipboardData:
         """Deserialize clipboard data from network transmission."""
         try:
-            # Validate required fields
-            required_fields = ['content', 'type', 'timestamp', 'device_name']
-            for field in required_fields:
-                if field not in packet_data:
-                    print(f"Error: Missing required field '{field}' in clipboard data")
-                    return None
+            # Validate required fields in one C-level subset check
+            if not CLIPBOARD_FIELDS.issubset(packet_data):
+                missing = ', '.join(sorted(CLIPBOARD_FIELDS.difference(packet_data)))
+                logger.warning("Missing required field(s) %s in clipboard data", missing)
+                return None
 
             content = packet_data['content']
 
@@ -123,24 +277,29 @@ class UDPClipboardNetwork(NetworkInterface):
             try:
                 clipboard_type = ClipboardType(packet_data['type'])
             except ValueError:
-                print(f"Error: Invalid clipboard type '{packet_data['type']}'")
+                logger.warning("Invalid clipboard type '%s'", packet_data['type'])
                 return None
 
-            if clipboard_type == ClipboardType.IMAGE:
+            if clipboard_type == ClipboardType.IMAGE and isinstance(content, str):
+                # Older peers send images base64-encoded inside JSON
                 try:
-                    content = base64.b64decode(content)
+                    content = b64decode(content)
                 except Exception as e:
-                    print(f"Error decoding base64 image data: {e}")
+                    logger.warning("Error decoding base64 image data: %s", e)
                     return None
 
-            # Ensure device_name is a string and content is properly encoded
-            device_name = str(packet_data['device_name'])
-            if isinstance(content, str):
-                # Ensure string content is properly encoded for cross-platform compatibility
+            encoding = packet_data.get('enc')
+            if encoding:
                 try:
-                    content = content.encode('utf-8').decode('utf-8')
-                except UnicodeError:
-                    content = str(content)  # Fallback to string conversion
+                    content = decompress_payload(encoding, content)
+                    if clipboard_type == ClipboardType.TEXT:
+                        content = content.decode('utf-8')
+                except Exception as e:
+                    logger.warning("Error decompressing %s payload: %s", encoding, e)
+                    return None
+
+            # Ensure device_name is a string; decoded text content is already a str
+            device_name = str(packet_data['device_name'])
 
             return ClipboardData(
                 content=content,
@@ -149,51 +308,134 @@ class UDPClipboardNetwork(NetworkInterface):
                 device_name=device_name
             )
         except Exception as e:
-            print(f"Error deserializing clipboard data: {e}")
+            logger.warning("Error deserializing clipboard data: %s", e)
             return None
 
     def _broadcast_packet(self, packet: NetworkPacket) -> None:
         """Broadcast a packet to the network on multiple ports."""
         try:
+            serialized_data = self._serialize_packet(packet)
+        except Exception as e:
+            logger.warning("Error serializing packet: %s", e)
+            return
+
+        self._broadcast_bytes(serialized_data)
+
+    def _broadcast_control(self, packet_type: str) -> None:
+        """Broadcast a control packet built from its cached template."""
+        if self._control_fields:
+            code = CONTROL_CODES[packet_type]
+            if self._multicast_joined:
+                code |= CONTROL_MULTICAST
+            self._broadcast_bytes(CONTROL_FRAME.pack(code, time.time(), *self._control_fields))
+            return
+
+        template = self._control_templates[packet_type]
+        template['timestamp'] = time.time()  # Concurrent senders only race on this value
+        template['data']['multicast'] = self._multicast_joined
+        self._broadcast_bytes(_dumps(template))
+
+    def _update_broadcast_targets(self) -> None:
+        """Resolve the (address, port) pairs packets are sent to."""
+        # Our listening port and the common ports, without duplicates
+        ports = list(dict.fromkeys([self.port] + self.broadcast_ports))
+
+        # Limited broadcast ('<broadcast>' is an alias for the same address)
+        broadcast_addresses = ['255.255.255.255']
+
+        # Add network-specific broadcast if possible
+        if self.device_ip and '.' in self.device_ip:
+            parts = self.device_ip.split('.')
+            if len(parts) == 4:
+                broadcast_addresses.append(f"{parts[0]}.{parts[1]}.{parts[2]}.255")
+
+        self._multicast_targets = [(MULTICAST_GROUP, port) for port in ports]
+        self._broadcast_targets = [
+            (address, port) for port in ports for address in broadcast_addresses
+        ]
+        self._broadcast_targets_verified = False
+
+    def _get_broadcast_socket(self) -> socket.socket:
+        """Return the long-lived send socket, creating it on first use."""
+        sock = self._broadcast_socket
+        if sock:
+            return sock
+
+        # Listener and clipboard threads both send; only one may create the socket
+        with self._broadcast_lock:
             if not self._broadcast_socket:
-                self._broadcast_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                self._broadcast_socket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
 
                 # Platform-specific socket options
                 if self.platform != 'Windows':
                     # On Linux/macOS, set broadcast timeout
-                    self._broadcast_socket.settimeout(2.0)
-
-            serialized_data = self._serialize_packet(packet)
-
-            # Broadcast to our listening port and common ports
-            ports_to_broadcast = [self.port] + self.broadcast_ports
-            ports_to_broadcast = list(set(ports_to_broadcast))  # Remove duplicates
+                    sock.settimeout(2.0)
+
+                self._multicast = enable_multicast_send(sock)
+                self._broadcast_socket = sock
+            return self._broadcast_socket
+
+    def _broadcast_bytes(self, serialized_data: bytes) -> None:
+        """Send already serialized data to every broadcast target."""
+        # Oversize packets fail with EMSGSIZE on every target; drop just this one
+        if len(serialized_data) > MAX_DATAGRAM_SIZE:
+            logger.warning("Dropping %d byte packet, larger than a UDP datagram",
+                           len(serialized_data))
+            return
 
-            for port in ports_to_broadcast:
-                try:
-                    # Try different broadcast addresses for better compatibility
-                    broadcast_addresses = ['<broadcast>', '255.255.255.255']
-
-                    # Add network-specific broadcast if possible
-                    if self.device_ip and '.' in self.device_ip:
-                        parts = self.device_ip.split('.')
-                        if len(parts) == 4:
-                            network_broadcast = f"{parts[0]}.{parts[1]}.{parts[2]}.255"
-                            broadcast_addresses.append(network_broadcast)
-
-                    for broadcast_addr in broadcast_addresses:
-                        try:
-                            self._broadcast_socket.sendto(serialized_data, (broadcast_addr, port))
-                        except Exception as e:
-                            # Silently continue for individual broadcast address failures
+        try:
+            sendto = self._get_broadcast_socket().sendto  # Bound once for the fan-out loops
+
+            # One multicast send per port reaches only sync-clip peers. Broadcast instead
+            # while we or any known peer cannot receive the group; broadcasts reach both.
+            if self._multicast and self._multicast_joined and not self._broadcast_peers:
+                for target in self._multicast_targets:
+                    try:
+                        sendto(serialized_data, target)
+                    except OSError as e:
+                        if e.errno not in UNROUTABLE_ERRNOS:
+                            logger.warning("Multicast send to port %d failed: %s", target[1], e)
                             continue
+                        # The group is unroutable here; broadcast for the rest of the session
+                        logger.warning("Multicast send failed, falling back to broadcast: %s", e)
+                        self._multicast = False
+                        break
+                else:
+                    return
+
+            # Verified targets skip the reachability bookkeeping of the probe below
+            if self._broadcast_targets_verified:
+                for target in self._broadcast_targets:
+                    try:
+                        sendto(serialized_data, target)
+                    except OSError as e:
+                        # Keep going so one failing target cannot starve the rest,
+                        # and re-probe the targets with the next packet
+                        logger.warning("Broadcast to %s:%d failed: %s", target[0], target[1], e)
+                        self._broadcast_targets_verified = False
+                return
+
+            # Otherwise probe each target with this packet and drop the unreachable ones
+            reachable = []
+            for target in self._broadcast_targets:
+                try:
+                    sendto(serialized_data, target)
+                    reachable.append(target)
+                except OSError as e:
+                    if e.errno not in UNROUTABLE_ERRNOS:
+                        logger.warning("Broadcast to %s:%d failed: %s", target[0], target[1], e)
+                        reachable.append(target)
+                        continue
+                    logger.warning("Dropping unreachable broadcast target %s:%d: %s",
+                                   target[0], target[1], e)
 
-                except Exception as e:
-                    print(f"Error broadcasting to port {port}: {e}")
+            if reachable:
+                self._broadcast_targets = reachable
+                self._broadcast_targets_verified = True
 
         except Exception as e:
-            print(f"Error broadcasting packet: {e}")
+            logger.warning("Error broadcasting packet: %s", e)
 
     def broadcast_clipboard(self, data: ClipboardData) -> None:
         """Broadcast clipboard data to network."""
@@ -208,70 +450,61 @@ class UDPClipboardNetwork(NetworkInterface):
 
     def announce_device(self) -> None:
         """Announce device presence to network."""
-        packet = NetworkPacket(
-            packet_type="device_announce",
-            sender_name=self.device_name,
-            sender_ip=self.device_ip,
-            timestamp=time.time(),
-            data={'platform': self.platform}
-        )
-        self._broadcast_packet(packet)
+        self._broadcast_control("device_announce")
 
     def discover_devices(self) -> None:
         """Send device discovery request."""
-        packet = NetworkPacket(
-            packet_type="device_discovery",
-            sender_name=self.device_name,
-            sender_ip=self.device_ip,
-            timestamp=time.time()
-        )
-        self._broadcast_packet(packet)
+        self._broadcast_control("device_discovery")
+
+    def _refresh_local_ip(self) -> None:
+        """Pick up a changed local address (e.g. after switching networks)."""
+        address = get_local_ip()
+        if address == self.device_ip:
+            return
+
+        print(f"Local IP changed from {self.device_ip} to {address}")
+        self.device_ip = address
+        self._build_control_packets()
+        self._update_broadcast_targets()
 
     def _send_heartbeat(self):
-        """Send periodic heartbeat to maintain presence."""
-        while self._listening:
-            try:
-                packet = NetworkPacket(
-                    packet_type="device_heartbeat",
-                    sender_name=self.device_name,
-                    sender_ip=self.device_ip,
-                    timestamp=time.time()
-                )
-                self._broadcast_packet(packet)
-                time.sleep(15)  # Send heartbeat every 15 seconds (reduced frequency)
-            except Exception as e:
-                print(f"Error sending heartbeat: {e}")
-                break
+        """Send a heartbeat to maintain presence."""
+        try:
+            self._refresh_local_ip()
+            self._broadcast_control("device_heartbeat")
+        except Exception as e:
+            logger.warning("Error sending heartbeat: %s", e)
 
     def _cleanup_devices(self):
         """Remove inactive devices."""
-        while self._listening:
-            try:
-                current_time = time.time()
-                with self._device_lock:
-                    inactive_devices = [
-                        device_id for device_id, device in self._connected_devices.items()
-                        if current_time - device.last_seen > self._device_timeout
-                    ]
-
-                    for device_id in inactive_devices:
-                        device = self._connected_devices[device_id]
-                        del self._connected_devices[device_id]
-                        if self._device_callback:
-                            self._device_callback('device_left', device)
-
-                time.sleep(5)  # Check every 5 seconds for stability (reduced frequency)
-            except Exception as e:
-                print(f"Error in device cleanup: {e}")
-                break
+        try:
+            current_time = time.time()
+            with self._device_lock:
+                inactive_devices = [
+                    device_id for device_id, device in self._connected_devices.items()
+                    if current_time - device.last_seen > self._device_timeout
+                ]
+
+                for device_id in inactive_devices:
+                    device = self._connected_devices[device_id]
+                    del self._connected_devices[device_id]
+                    self._broadcast_peers.discard(device_id)
+                    if self._device_callback:
+                        self._device_callback('device_left', device)
+        except Exception as e:
+            print(f"Error in device cleanup: {e}")
 
-    def _update_device(self, device_info: DeviceInfo):
+    def _update_device(self, device_info: DeviceInfo, multicast: bool = False):
         """Update or add device information."""
         with self._device_lock:
             device_id = f"{device_info.name}@{device_info.ip_address}"
             is_new = device_id not in self._connected_devices
 
             self._connected_devices[device_id] = device_info
+            if multicast:
+                self._broadcast_peers.discard(device_id)
+            else:
+                self._broadcast_peers.add(device_id)
 
             if is_new and self._device_callback:
                 self._device_callback('device_joined', device_info)
@@ -284,9 +517,6 @@ class UDPClipboardNetwork(NetworkInterface):
 
         sender_device_id = f"{packet.sender_name}@{packet.sender_ip}"
 
-        # Debug: Print packet type for debugging (can be removed in production)
-        # print(f"Debug: Received packet type '{packet.packet_type}' from {packet.sender_name}")
-
         if packet.packet_type in ["device_announce", "device_discovery", "device_heartbeat"]:
             # Device management packets
             device_info = DeviceInfo(
@@ -295,7 +525,7 @@ class UDPClipboardNetwork(NetworkInterface):
                 last_seen=packet.timestamp,
                 platform=packet.data.get('platform', 'Unknown') if packet.data else 'Unknown'
             )
-            self._update_device(device_info)
+            self._update_device(device_info, bool(packet.data and packet.data.get('multicast')))
 
             # Respond to discovery requests
             if packet.packet_type == "device_discovery":
@@ -306,31 +536,33 @@ class UDPClipboardNetwork(NetworkInterface):
             clipboard_data = self._deserialize_clipboard_data(packet.data)
             if clipboard_data and self._clipboard_callback:
                 # Check for duplicate data using a unique identifier
-                data_id = f"{packet.sender_name}@{packet.sender_ip}:{clipboard_data.timestamp}:{hash(str(clipboard_data.content)[:100])}"
+                content = clipboard_data.content
+                if isinstance(content, str):
+                    content = content.encode('utf-8', 'ignore')
+                digest = hashlib.blake2b(content, digest_size=8).digest()
+                data_id = (packet.sender_name, packet.sender_ip, clipboard_data.timestamp, digest)
 
                 with self._dedup_lock:
                     if data_id in self._processed_clipboard_data:
                         # Duplicate data, skip processing
                         return
 
-                    # Add to processed set and clean old entries (keep only recent ones)
+                    # Remember the id, evicting the oldest once 100 are tracked
+                    if len(self._processed_clipboard_order) >= 100:
+                        oldest = self._processed_clipboard_order.popleft()
+                        self._processed_clipboard_data.discard(oldest)
+                    self._processed_clipboard_order.append(data_id)
                     self._processed_clipboard_data.add(data_id)
 
-                    # Clean up old entries to prevent memory leak (keep only last 100)
-                    if len(self._processed_clipboard_data) > 100:
-                        # Remove oldest 50 entries
-                        old_entries = list(self._processed_clipboard_data)[:50]
-                        for entry in old_entries:
-                            self._processed_clipboard_data.discard(entry)
-
                 # Process the unique clipboard data
                 self._clipboard_callback(clipboard_data)
         else:
             # Unknown packet type - log for debugging
-            print(f"Warning: Unknown packet type '{packet.packet_type}' from {sender_device_id}")
+            logger.warning("Unknown packet type '%s' from %s", packet.packet_type, sender_device_id)
 
     def _listen_loop(self):
         """Main listening loop."""
+        selector = selectors.DefaultSelector()
         try:
             self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
@@ -348,6 +580,12 @@ class UDPClipboardNetwork(NetworkInterface):
                 except AttributeError:
                     pass
 
+            # Larger kernel queue so bursts are not dropped while a packet is being handled
+            try:
+                self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECV_BUFFER_SIZE)
+            except OSError:
+                pass
+
             # Try to bind to the specified port, fallback to random port if unavailable
             bind_success = False
             for attempt in range(10):  # Try 10 times
@@ -372,27 +610,47 @@ class UDPClipboardNetwork(NetworkInterface):
             if not bind_success:
                 raise Exception("Could not bind to any port in range")
 
-            self._socket.settimeout(1.0)  # Set timeout for periodic checks
+            # Block in select() until data arrives or stop_listening() wakes us
+            self._socket.setblocking(False)
+            self._multicast_joined = join_multicast_group(self._socket)
+            selector.register(self._socket, selectors.EVENT_READ)
+            selector.register(self._wakeup_recv, selectors.EVENT_READ)
+            self._update_broadcast_targets()
             print(f"Successfully bound to port {self.port} on {self.platform}")
 
+            last_heartbeat = 0
+            last_cleanup = time.time()
+
             while self._listening:
+                current_time = time.time()
+
+                # Heartbeats and cleanup run on this thread between packets
+                if current_time - last_heartbeat >= self._heartbeat_interval:
+                    self._send_heartbeat()
+                    last_heartbeat = current_time
+
+                if current_time - last_cleanup >= self._cleanup_interval:
+                    self._cleanup_devices()
+                    last_cleanup = current_time
+
+                # Sleep until a packet arrives, the next timer is due, or we are stopped
+                next_due = min(last_heartbeat + self._heartbeat_interval,
+                               last_cleanup + self._cleanup_interval)
+                if not selector.select(max(0.0, next_due - time.time())) or not self._listening:
+                    continue
+
                 try:
-                    data, addr = self._socket.recvfrom(65536)
-                    packet = self._deserialize_packet(data)
-                    if packet:
-                        self._handle_packet(packet, addr)
-                    else:
-                        # Debug: Failed to deserialize packet
-                        # print(f"Debug: Failed to deserialize packet from {addr}, data length: {len(data)}")
-                        # Print first few bytes for debugging
-                        # if len(data) > 0:
-                        #     try:
-                        #         preview = data[:50].decode('utf-8', errors='ignore')
-                        #         print(f"Data preview: {preview}")
-                        #     except:
-                        #         print(f"Data bytes: {data[:20]}")
-                        pass
-                except socket.timeout:
+                    # Drain queued datagrams until the socket would block, up to a batch per wakeup
+                    for _ in range(MAX_RECV_BATCH):
+                        nbytes, addr = self._socket.recvfrom_into(self._recv_buffer)
+                        if self._is_own_packet(nbytes):
+                            continue  # Multicast/broadcast loopback of our own send
+
+                        # Undecodable packets are logged by _deserialize_packet
+                        packet = self._deserialize_packet(self._recv_view[:nbytes])
+                        if packet:
+                            self._handle_packet(packet, addr)
+                except BlockingIOError:
                     continue
                 except OSError as e:
                     # Handle socket closure gracefully
@@ -400,13 +658,15 @@ class UDPClipboardNetwork(NetworkInterface):
                         # Socket was closed, exit the loop
                         break
                     else:
-                        print(f"Error receiving data: {e}")
+                        logger.warning("Error receiving data: %s", e)
                 except Exception as e:
-                    print(f"Error receiving data: {e}")
+                    logger.warning("Error receiving data: %s", e)
 
         except Exception as e:
             print(f"Error setting up listener: {e}")
         finally:
+            selector.close()
+            self._wakeup_recv.close()
             if self._socket:
                 self._socket.close()
             if self._broadcast_socket:
@@ -419,19 +679,12 @@ class UDPClipboardNetwork(NetworkInterface):
 
         self._clipboard_callback = clipboard_callback
         self._listening = True
+        self._wakeup_recv, self._wakeup_send = socket.socketpair()
 
-        # Start main listening thread
+        # Start main listening thread (heartbeats and cleanup are scheduled on it)
         self._listen_thread = threading.Thread(target=self._listen_loop, daemon=True)
         self._listen_thread.start()
 
-        # Start heartbeat thread
-        self._heartbeat_thread = threading.Thread(target=self._send_heartbeat, daemon=True)
-        self._heartbeat_thread.start()
-
-        # Start device cleanup thread
-        self._cleanup_thread = threading.Thread(target=self._cleanup_devices, daemon=True)
-        self._cleanup_thread.start()
-
         # Announce device and discover others
         time.sleep(1)  # Give listener time to start
         self.announce_device()
@@ -441,6 +694,15 @@ class UDPClipboardNetwork(NetworkInterface):
         """Stop listening for clipboard data."""
         self._listening = False
 
+        # Wake the listener out of select() before its socket goes away
+        if self._wakeup_send:
+            try:
+                self._wakeup_send.send(b'\0')
+            except OSError:
+                pass
+            self._wakeup_send.close()
+            self._wakeup_send = None
+
         # Close sockets to interrupt listening loops
         if self._socket:
             try:
@@ -456,12 +718,12 @@ class UDPClipboardNetwork(NetworkInterface):
                 print(f"Error closing broadcast socket: {e}")
             self._broadcast_socket = None
 
-        # Wait for threads to finish with longer timeout
-        for thread in [self._listen_thread, self._heartbeat_thread, self._cleanup_thread]:
-            if thread and thread.is_alive():
-                thread.join(timeout=5)
-                if thread.is_alive():
-                    print(f"Warning: Thread {thread.name} did not shutdown gracefully")
+        # Wait for the listener to finish
+        thread = self._listen_thread
+        if thread and thread.is_alive():
+            thread.join(timeout=5)
+            if thread.is_alive():
+                print(f"Warning: Thread {thread.name} did not shutdown gracefully")
 
     def get_connected_devices(self) -> List[DeviceInfo]:
         """Get list of connected devices."""
@@ -2,18 +2,57 @@
 import asyncio
 import websockets
 import json
+import logging
 import threading
 import time
-import base64
 import platform
 import socket
-from typing import Callable, Dict, Any, List, Set
+import struct
+from collections import OrderedDict
+from operator import itemgetter
+from typing import Callable, Dict, Any, List, Optional, Set, Tuple
 from datetime import datetime
 
 from interfaces import (
     NetworkInterface, ClipboardData, ClipboardType,
     DeviceInfo, NetworkPacket
 )
+from .local_ip import get_local_ip
+from .compression import ENCODINGS, DEFAULT_ENCODING, compress_payload, decompress_payload
+
+try:
+    from pybase64 import b64decode  # Optional SIMD codec, same API as base64
+except ImportError:
+    from base64 import b64decode
+
+try:
+    import orjson  # Optional C-accelerated codec, wire-compatible with json
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode('utf-8')  # Text frames carry str
+
+    _loads = orjson.loads
+except ImportError:
+    _dumps = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False).encode
+    _loads = json.loads
+
+# Clipboard updates travel as one binary frame: type tag, payload encoding,
+# clipboard timestamp and the byte lengths of sender name, sender IP and device
+# name, followed by those strings and the content (UTF-8 text or image bytes).
+CLIPBOARD_FRAME = struct.Struct('<BBdHHH')
+FRAME_TAGS = {ClipboardType.TEXT: 0x01, ClipboardType.IMAGE: 0x02}
+FRAME_TYPES = {tag: clipboard_type for clipboard_type, tag in FRAME_TAGS.items()}
+# Positional field order of NetworkPacket (minus data) and ClipboardData (minus content)
+_packet_fields = itemgetter('packet_type', 'sender_name', 'sender_ip', 'timestamp')
+_clipboard_fields = itemgetter('type', 'timestamp', 'device_name')
+
+OFFLOAD_THRESHOLD = 64 * 1024  # Decode larger messages off the event loop
+
+CLIENT_QUEUE_SIZE = 32  # Pending broadcasts per client before updates are dropped
+
+MAX_PROCESSED_PACKETS = 4096  # Bounded memory for clipboard dedup
+
+logger = logging.getLogger(__name__)  # Per-packet errors; formatting is deferred
 
 class SimpleWebSocketNetwork(NetworkInterface):
     """Simplified WebSocket network communication."""
@@ -21,17 +60,28 @@ class SimpleWebSocketNetwork(NetworkInterface):
     def __init__(self, port: int = 8765):
         self.port = port
         self.device_name = socket.gethostname()
-        self.device_ip = self._get_local_ip()
+        self.device_ip = get_local_ip()
         self.platform = platform.system()
 
+        # Cached identity for per-packet self checks and frame encoding
+        self._self_id = (self.device_name, self.device_ip)
+        self._dev_name_b = self.device_name.encode('utf-8')
+        self._dev_ip_b = self.device_ip.encode('utf-8')
+
+        # Image payload compression, level 1 for near-memcpy speed
+        self._encoding = DEFAULT_ENCODING
+
         # Server state
         self.server = None
         self.clients = {}
+        self._loopback_clients: Set[str] = set()  # Clients that identified as this device
         self.running = False
 
         # Event loop
         self.loop = None
         self.thread = None
+        # Set once the server is listening (or failed to start)
+        self._server_ready = threading.Event()
 
         # Callbacks
         self._clipboard_callback = None
@@ -39,20 +89,8 @@ class SimpleWebSocketNetwork(NetworkInterface):
 
         # Device management
         self.connected_devices = {}
-        self.processed_data = set()
-
-    def _get_local_ip(self) -> str:
-        """Get local IP address."""
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
-                s.connect(("8.8.8.8", 80))
-                return s.getsockname()[0]
-        except Exception:
-            try:
-                hostname = socket.gethostname()
-                return socket.gethostbyname(hostname)
-            except Exception:
-                return "127.0.0.1"
+        # Hashes of seen clipboard packets
+        self.processed_data: OrderedDict[int, None] = OrderedDict()
 
     def _serialize_packet(self, packet: NetworkPacket) -> str:
         """Serialize network packet for transmission."""
@@ -63,59 +101,97 @@ class SimpleWebSocketNetwork(NetworkInterface):
             'timestamp': packet.timestamp,
             'data': packet.data
         }
-        return json.dumps(data, ensure_ascii=False)
+        return _dumps(data)
 
     def _deserialize_packet(self, data: str) -> NetworkPacket:
         """Deserialize network packet from transmission."""
         try:
-            packet_data = json.loads(data)
-            return NetworkPacket(
-                packet_type=packet_data['packet_type'],
-                sender_name=packet_data['sender_name'],
-                sender_ip=packet_data['sender_ip'],
-                timestamp=packet_data['timestamp'],
-                data=packet_data.get('data')
-            )
+            packet_data = _loads(data)
+            return NetworkPacket(*_packet_fields(packet_data), packet_data.get('data'))
         except Exception as e:
-            print(f"Error deserializing packet: {e}")
+            logger.warning("Error deserializing packet: %s", e)
             return None
 
-    def _serialize_clipboard_data(self, data: ClipboardData) -> Dict[str, Any]:
-        """Serialize clipboard data for network transmission."""
-        packet_data = {
-            'type': data.type.value,
-            'timestamp': data.timestamp,
-            'device_name': data.device_name
-        }
-
-        if data.type == ClipboardType.TEXT:
-            packet_data['content'] = data.content
-        elif data.type == ClipboardType.IMAGE:
-            packet_data['content'] = base64.b64encode(data.content).decode('utf-8')
-
-        return packet_data
+    def _encode_image(self, payload: bytes) -> Tuple[int, bytes]:
+        """Compress a large image payload, returning the encoding index and the bytes to send."""
+        encoding, payload = compress_payload(payload, self._encoding)
+        return ENCODINGS.index(encoding), payload
 
     def _deserialize_clipboard_data(self, packet_data: Dict[str, Any]) -> ClipboardData:
         """Deserialize clipboard data from network transmission."""
         try:
             content = packet_data['content']
-            if packet_data['type'] == ClipboardType.IMAGE.value:
-                content = base64.b64decode(content)
+            if packet_data['type'] == ClipboardType.IMAGE.value and isinstance(content, str):
+                # Older peers send images base64-encoded inside the JSON packet
+                content = b64decode(content)
+
+            content = decompress_payload(packet_data.get('enc'), content)
 
+            clipboard_type, timestamp, device_name = _clipboard_fields(packet_data)
             return ClipboardData(
-                content=content,
-                type=ClipboardType(packet_data['type']),
-                timestamp=float(packet_data['timestamp']),
-                device_name=packet_data['device_name']
+                content, ClipboardType(clipboard_type), float(timestamp), device_name
+            )
+        except Exception as e:
+            logger.warning("Error deserializing clipboard data: %s", e)
+            return None
+
+    def _serialize_frame(self, data: ClipboardData) -> bytes:
+        """Pack clipboard data into a tagged binary frame, bypassing JSON and base64."""
+        if data.type == ClipboardType.TEXT:
+            encoding, content = 0, data.content.encode('utf-8')
+        else:
+            encoding, content = self._encode_image(data.content)
+
+        device_name = data.device_name.encode('utf-8')
+        header = CLIPBOARD_FRAME.pack(FRAME_TAGS[data.type], encoding, data.timestamp,
+                                      len(self._dev_name_b), len(self._dev_ip_b), len(device_name))
+        return b''.join((header, self._dev_name_b, self._dev_ip_b, device_name, content))
+
+    def _deserialize_frame(self, frame: bytes) -> Optional[NetworkPacket]:
+        """Unpack a tagged clipboard frame into a clipboard packet."""
+        try:
+            (tag, encoding, timestamp,
+             name_len, ip_len, device_len) = CLIPBOARD_FRAME.unpack_from(frame)
+            offset = CLIPBOARD_FRAME.size
+            sender_name = frame[offset:offset + name_len]
+            offset += name_len
+            sender_ip = frame[offset:offset + ip_len]
+            offset += ip_len
+            if sender_name == self._dev_name_b and sender_ip == self._dev_ip_b:
+                return None  # Our own update echoed back; skip decoding the content
+            device_name = frame[offset:offset + device_len].decode('utf-8')
+            offset += device_len
+
+            clipboard_type = FRAME_TYPES[tag]
+            content = frame[offset:]
+            if clipboard_type == ClipboardType.TEXT:
+                content = content.decode('utf-8')
+
+            return NetworkPacket(
+                packet_type="clipboard_data",
+                sender_name=sender_name.decode('utf-8'),
+                sender_ip=sender_ip.decode('utf-8'),
+                timestamp=timestamp,
+                data={
+                    'type': clipboard_type.value,
+                    'timestamp': timestamp,
+                    'device_name': device_name,
+                    'content': content,
+                    'enc': ENCODINGS[encoding]
+                }
             )
         except Exception as e:
-            print(f"Error deserializing clipboard data: {e}")
+            logger.warning("Error deserializing clipboard frame: %s", e)
             return None
 
-    async def _handle_client(self, websocket, path):
+    async def _handle_client(self, websocket, path=None):
         """Handle a WebSocket client connection."""
         client_id = f"{websocket.remote_address[0]}:{websocket.remote_address[1]}"
-        self.clients[client_id] = websocket
+
+        # All outgoing messages go through one queue drained by the client's sender task
+        outbox: asyncio.Queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        self.clients[client_id] = (websocket, outbox)
+        sender = asyncio.create_task(self._client_sender(client_id, websocket, outbox))
 
         # Send device info to client
         device_info = DeviceInfo(
@@ -134,7 +210,7 @@ class SimpleWebSocketNetwork(NetworkInterface):
         )
 
         try:
-            await websocket.send(self._serialize_packet(device_packet))
+            outbox.put_nowait(self._serialize_packet(device_packet))
 
             # Add to connected devices
             device_id = f"{self.device_name}@{self.device_ip}"
@@ -144,8 +220,19 @@ class SimpleWebSocketNetwork(NetworkInterface):
 
             # Listen for messages
             async for message in websocket:
-                packet = self._deserialize_packet(message)
-                if packet:
+                # Binary messages are clipboard frames, text messages are JSON packets
+                if isinstance(message, bytes):
+                    packet = await self._decode(self._deserialize_frame, message, len(message))
+                else:
+                    packet = await self._decode(self._deserialize_packet, message, len(message))
+                if not packet:
+                    continue
+
+                sender_id = (packet.sender_name, packet.sender_ip)
+                if packet.packet_type == "device_info" and sender_id == self._self_id:
+                    # Our own mirror; never send it our updates
+                    self._loopback_clients.add(client_id)
+                else:
                     await self._handle_packet(packet)
 
         except websockets.exceptions.ConnectionClosed:
@@ -154,12 +241,35 @@ class SimpleWebSocketNetwork(NetworkInterface):
             print(f"Error handling client {client_id}: {e}")
         finally:
             # Remove client
+            sender.cancel()
+            # Before clients, so broadcasts never see it as the only peer
+            self._loopback_clients.discard(client_id)
             if client_id in self.clients:
                 del self.clients[client_id]
 
+    async def _client_sender(self, client_id: str, websocket, outbox: asyncio.Queue):
+        """Drain one client's outbox onto its connection."""
+        try:
+            while True:
+                await websocket.send(await outbox.get())
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        except Exception as e:
+            logger.warning("Error sending to %s: %s", client_id, e)
+
+    async def _decode(self, decoder: Callable[[Any], Any], data: Any, size: int) -> Any:
+        """Run a decoder inline, or in the default executor for large messages.
+
+        Offloading keeps the event loop responsive while big frames are decoded.
+        """
+        if size > OFFLOAD_THRESHOLD:
+            # Several connections can decode at once here, so decoders keep no shared state
+            return await self.loop.run_in_executor(None, decoder, data)
+        return decoder(data)
+
     async def _handle_packet(self, packet: NetworkPacket):
         """Handle incoming packets."""
-        if packet.sender_name == self.device_name and packet.sender_ip == self.device_ip:
+        if (packet.sender_name, packet.sender_ip) == self._self_id:
             return
 
         if packet.packet_type == "device_info":
@@ -180,12 +290,16 @@ class SimpleWebSocketNetwork(NetworkInterface):
 
         elif packet.packet_type == "clipboard_data":
             # Handle clipboard data
-            clipboard_data = self._deserialize_clipboard_data(packet.data)
+            content = packet.data.get('content')
+            size = len(content) if content is not None else 0
+            clipboard_data = await self._decode(self._deserialize_clipboard_data, packet.data, size)
             if clipboard_data and self._clipboard_callback:
                 # Check for duplicates
-                data_id = f"{packet.sender_name}@{packet.sender_ip}:{clipboard_data.timestamp}"
+                data_id = hash((packet.sender_name, packet.sender_ip, clipboard_data.timestamp))
                 if data_id not in self.processed_data:
-                    self.processed_data.add(data_id)
+                    self.processed_data[data_id] = None
+                    if len(self.processed_data) > MAX_PROCESSED_PACKETS:
+                        self.processed_data.popitem(last=False)
                     self._clipboard_callback(clipboard_data)
 
     async def _run_server(self):
@@ -199,11 +313,13 @@ class SimpleWebSocketNetwork(NetworkInterface):
                 ping_timeout=10
             )
             print(f"WebSocket server started on port {self.port}")
+            self._server_ready.set()
 
             # Keep server running
             await asyncio.Future()  # Wait forever
         except Exception as e:
             print(f"WebSocket server error: {e}")
+            self._server_ready.set()  # Do not keep start_listening waiting
 
     def _run_event_loop(self):
         """Run event loop in thread."""
@@ -221,13 +337,14 @@ class SimpleWebSocketNetwork(NetworkInterface):
 
         self._clipboard_callback = clipboard_callback
         self.running = True
+        self._server_ready.clear()
 
         # Start server in separate thread
         self.thread = threading.Thread(target=self._run_event_loop, daemon=True)
         self.thread.start()
 
-        # Give server time to start
-        time.sleep(1)
+        # Wait until the server is accepting connections
+        self._server_ready.wait(timeout=5)
 
     def stop_listening(self) -> None:
         """Stop listening."""
@@ -244,34 +361,23 @@ class SimpleWebSocketNetwork(NetworkInterface):
 
     def broadcast_clipboard(self, data: ClipboardData) -> None:
         """Broadcast clipboard data."""
-        if not self.clients:
+        # Loopback clients are a subset of clients; equal counts mean no real peer to serialize for
+        if len(self._loopback_clients) >= len(self.clients):
             return
 
-        packet = NetworkPacket(
-            packet_type="clipboard_data",
-            sender_name=self.device_name,
-            sender_ip=self.device_ip,
-            timestamp=time.time(),
-            data=self._serialize_clipboard_data(data)
-        )
-
-        message = self._serialize_packet(packet)
-        disconnected = []
+        # One loop wakeup hands the frame to every client's sender task;
+        # the caller never waits on I/O
+        self.loop.call_soon_threadsafe(self._fan_out, self._serialize_frame(data))
 
-        for client_id, websocket in list(self.clients.items()):
+    def _fan_out(self, frame: bytes):
+        """Queue a frame for every client on the loop thread, dropping it where backed up."""
+        for client_id, (_, outbox) in self.clients.items():
+            if client_id in self._loopback_clients:
+                continue
             try:
-                asyncio.run_coroutine_threadsafe(
-                    websocket.send(message),
-                    self.loop
-                ).result(timeout=1)
-            except Exception as e:
-                print(f"Error sending to {client_id}: {e}")
-                disconnected.append(client_id)
-
-        # Remove disconnected clients
-        for client_id in disconnected:
-            if client_id in self.clients:
-                del self.clients[client_id]
+                outbox.put_nowait(frame)
+            except asyncio.QueueFull:
+                logger.warning("Dropping clipboard update for slow client %s", client_id)
 
     def get_connected_devices(self) -> List[DeviceInfo]:
         """Get connected devices."""
@@ -2,19 +2,54 @@
 import asyncio
 import websockets
 import json
+import logging
 import threading
 import time
-import base64
+import hashlib
 import platform
-from typing import Callable, Dict, Any, List, Set
+from typing import Callable, Dict, Any, List, Union
 from datetime import datetime
 import socket
+from collections import OrderedDict
 
 from interfaces import (
     NetworkInterface, ClipboardData, ClipboardType,
     DeviceInfo, NetworkPacket
 )
 from .device_discovery import WebSocketDeviceDiscovery
+from .local_ip import get_local_ip
+from .network import FRAME_MAGIC, FRAME_HEADER, FRAME_KIND_CLIPBOARD, FRAME_FIELDS
+from .compression import ENCODINGS, COMPRESS_THRESHOLD, compress_payload, decompress_payload
+
+try:
+    from pybase64 import b64decode  # Optional SIMD codec, same API as base64
+except ImportError:
+    from base64 import b64decode
+
+try:
+    import orjson  # Optional C-accelerated codec, wire-compatible with json
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    _json_encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+
+    def _dumps(obj: Any) -> bytes:
+        return _json_encoder.encode(obj).encode('utf-8')
+
+    _loads = json.loads  # Accepts UTF-8 bytes directly
+
+try:
+    import uvloop  # Optional libuv event loop; not available on Windows
+except ImportError:
+    uvloop = None
+
+CLIPBOARD_FIELDS = frozenset(('content', 'type', 'timestamp', 'device_name'))
+
+MAX_PROCESSED_PACKETS = 100  # Recent clipboard packets remembered for dedup
+
+HELLO_TTL = 1.0  # Seconds a serialized device_info greeting is reused
+
+logger = logging.getLogger(__name__)  # Per-packet errors; formatting is deferred
 
 class WebSocketClipboardNetwork(NetworkInterface):
     """WebSocket-based network communication with persistent connections."""
@@ -22,18 +57,21 @@ class WebSocketClipboardNetwork(NetworkInterface):
     def __init__(self, port: int = 8765):
         self.port = port
         self.device_name = socket.gethostname()
-        self.device_ip = self._get_local_ip()
+        self.device_ip = get_local_ip()
         self.platform = platform.system()
 
         # WebSocket server and clients
         self.server = None
         self.clients: Dict[str, websockets.WebSocketServerProtocol] = {}
+        self._clients_snapshot: tuple = ()  # Immutable (client_id, websocket) pairs for broadcasts
         self.server_task = None
 
         # Connection management
         self._running = False
         self._loop = None
         self._thread = None
+        # Set once the server is listening (or failed to start)
+        self._server_ready = threading.Event()
 
         # Callbacks
         self._clipboard_callback = None
@@ -46,26 +84,15 @@ class WebSocketClipboardNetwork(NetworkInterface):
         # Device discovery
         self.discovery = WebSocketDeviceDiscovery(websocket_port=port)
 
-        # Data deduplication
-        self._processed_data: Set[str] = set()
+        # Serialized device_info greeting and the monotonic time it was built
+        self._hello = (0.0, b'')
 
-    def _get_local_ip(self) -> str:
-        """Get local IP address."""
-        try:
-            # Try to connect to an external address to find the local IP
-            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
-                s.connect(("8.8.8.8", 80))
-                return s.getsockname()[0]
-        except Exception:
-            # Fallback methods
-            try:
-                hostname = socket.gethostname()
-                return socket.gethostbyname(hostname)
-            except Exception:
-                return "127.0.0.1"
+        # Data deduplication
+        # Insertion order gives FIFO eviction
+        self._processed_data: OrderedDict[bytes, None] = OrderedDict()
 
-    def _serialize_packet(self, packet: NetworkPacket) -> str:
-        """Serialize network packet for WebSocket transmission."""
+    def _serialize_packet(self, packet: NetworkPacket) -> bytes:
+        """Serialize network packet as UTF-8 JSON, sent as a binary WebSocket frame."""
         data = {
             'packet_type': packet.packet_type,
             'sender_name': packet.sender_name,
@@ -73,12 +100,46 @@ class WebSocketClipboardNetwork(NetworkInterface):
             'timestamp': packet.timestamp,
             'data': packet.data
         }
-        return json.dumps(data, ensure_ascii=False)
 
-    def _deserialize_packet(self, data: str) -> NetworkPacket:
-        """Deserialize network packet from WebSocket transmission."""
+        # Raw image bytes follow the JSON metadata in the UDP backend's binary frame layout
+        content = packet.data.get('content') if isinstance(packet.data, dict) else None
+        if isinstance(content, bytes):
+            data['data'] = {
+                key: value for key, value in packet.data.items() if key not in FRAME_FIELDS
+            }
+            meta = _dumps(data)
+            flags = ENCODINGS.index(packet.data.get('enc'))  # Payload codec, 0 for raw
+            header = FRAME_HEADER.pack(
+                FRAME_MAGIC, FRAME_KIND_CLIPBOARD, flags, 0, len(meta), len(content)
+            )
+            return b''.join((header, meta, content))
+
+        return _dumps(data)
+
+    def _unpack_frame(self, data: bytes) -> Dict[str, Any]:
+        """Split a binary frame into its packet dict, restoring the raw payload as content."""
+        _, kind, flags, _, meta_len, payload_len = FRAME_HEADER.unpack_from(data)
+        if kind != FRAME_KIND_CLIPBOARD:
+            raise ValueError(f"Unknown frame kind {kind}")
+
+        start = FRAME_HEADER.size
+        packet_data = _loads(data[start:start + meta_len])
+        payload = data[start + meta_len:start + meta_len + payload_len]
+        if len(payload) != payload_len:
+            raise ValueError("Truncated frame")
+
+        packet_data['data']['content'] = payload
+        if flags:
+            packet_data['data']['enc'] = ENCODINGS[flags]
+        return packet_data
+
+    def _deserialize_packet(self, data: Union[str, bytes]) -> NetworkPacket:
+        """Deserialize network packet from a text or binary WebSocket frame."""
         try:
-            packet_data = json.loads(data)
+            if isinstance(data, bytes) and data[:4] == FRAME_MAGIC:
+                packet_data = self._unpack_frame(data)
+            else:
+                packet_data = _loads(data)
             return NetworkPacket(
                 packet_type=packet_data['packet_type'],
                 sender_name=packet_data['sender_name'],
@@ -87,7 +148,7 @@ class WebSocketClipboardNetwork(NetworkInterface):
                 data=packet_data.get('data')
             )
         except Exception as e:
-            print(f"Error deserializing packet: {e}")
+            logger.warning("Error deserializing packet: %s", e)
             return None
 
     def _serialize_clipboard_data(self, data: ClipboardData) -> Dict[str, Any]:
@@ -98,23 +159,27 @@ class WebSocketClipboardNetwork(NetworkInterface):
             'device_name': data.device_name
         }
 
-        if data.type == ClipboardType.TEXT:
-            packet_data['content'] = data.content
-        elif data.type == ClipboardType.IMAGE:
-            # Encode image as base64
-            packet_data['content'] = base64.b64encode(data.content).decode('utf-8')
-
+        content = data.content
+        if len(content) > COMPRESS_THRESHOLD:
+            # Large payloads go out compressed as raw bytes; 'enc' names the codec
+            raw = content.encode('utf-8') if data.type == ClipboardType.TEXT else content
+            encoding, compressed = compress_payload(raw)
+            if encoding:
+                packet_data['enc'] = encoding
+                content = compressed
+
+        # Bytes (images, compressed text); _serialize_packet sends them in a binary frame
+        packet_data['content'] = content
         return packet_data
 
     def _deserialize_clipboard_data(self, packet_data: Dict[str, Any]) -> ClipboardData:
         """Deserialize clipboard data from network transmission."""
         try:
-            # Validate required fields
-            required_fields = ['content', 'type', 'timestamp', 'device_name']
-            for field in required_fields:
-                if field not in packet_data:
-                    print(f"Error: Missing required field '{field}' in clipboard data")
-                    return None
+            # Validate required fields in one C-level subset check
+            if not CLIPBOARD_FIELDS.issubset(packet_data):
+                missing = ', '.join(sorted(CLIPBOARD_FIELDS.difference(packet_data)))
+                logger.warning("Missing required field(s) %s in clipboard data", missing)
+                return None
 
             content = packet_data['content']
 
@@ -122,24 +187,29 @@ class WebSocketClipboardNetwork(NetworkInterface):
             try:
                 clipboard_type = ClipboardType(packet_data['type'])
             except ValueError:
-                print(f"Error: Invalid clipboard type '{packet_data['type']}'")
+                logger.warning("Invalid clipboard type '%s'", packet_data['type'])
                 return None
 
-            if clipboard_type == ClipboardType.IMAGE:
+            if clipboard_type == ClipboardType.IMAGE and isinstance(content, str):
+                # Older peers send images base64-encoded inside the JSON packet
                 try:
-                    content = base64.b64decode(content)
+                    content = b64decode(content)
                 except Exception as e:
-                    print(f"Error decoding base64 image data: {e}")
+                    logger.warning("Error decoding base64 image data: %s", e)
                     return None
 
-            # Ensure device_name is a string and content is properly encoded
-            device_name = str(packet_data['device_name'])
-            if isinstance(content, str):
-                # Ensure string content is properly encoded for cross-platform compatibility
+            encoding = packet_data.get('enc')
+            if encoding:
                 try:
-                    content = content.encode('utf-8').decode('utf-8')
-                except UnicodeError:
-                    content = str(content)  # Fallback to string conversion
+                    content = decompress_payload(encoding, content)
+                    if clipboard_type == ClipboardType.TEXT:
+                        content = content.decode('utf-8')
+                except Exception as e:
+                    logger.warning("Error decompressing %s payload: %s", encoding, e)
+                    return None
+
+            # Ensure device_name is a string; decoded text content is already a str
+            device_name = str(packet_data['device_name'])
 
             return ClipboardData(
                 content=content,
@@ -148,39 +218,44 @@ class WebSocketClipboardNetwork(NetworkInterface):
                 device_name=device_name
             )
         except Exception as e:
-            print(f"Error deserializing clipboard data: {e}")
+            logger.warning("Error deserializing clipboard data: %s", e)
             return None
 
-    async def _handle_client(self, websocket, path):
+    def _hello_payload(self) -> bytes:
+        """Get the serialized device_info greeting, rebuilt at most once per HELLO_TTL."""
+        built_at, payload = self._hello
+        now = time.monotonic()
+        if payload and now - built_at < HELLO_TTL:
+            return payload
+
+        payload = self._serialize_packet(NetworkPacket(
+            packet_type="device_info",
+            sender_name=self.device_name,
+            sender_ip=self.device_ip,
+            timestamp=time.time(),
+            data={
+                'platform': self.platform,
+                'device_info': {
+                    'name': self.device_name,
+                    'ip_address': self.device_ip,
+                    'platform': self.platform
+                }
+            }
+        ))
+        self._hello = (now, payload)
+        return payload
+
+    async def _handle_client(self, websocket, path=None):
         """Handle a WebSocket client connection."""
         client_id = f"{websocket.remote_address[0]}:{websocket.remote_address[1]}"
 
         # Register client
         self.clients[client_id] = websocket
+        self._rebuild_snapshot()
 
         try:
             # Send device info to new client
-            device_info = DeviceInfo(
-                name=self.device_name,
-                ip_address=self.device_ip,
-                last_seen=time.time(),
-                platform=self.platform
-            )
-
-            await websocket.send(self._serialize_packet(NetworkPacket(
-                packet_type="device_info",
-                sender_name=self.device_name,
-                sender_ip=self.device_ip,
-                timestamp=time.time(),
-                data={
-                    'platform': self.platform,
-                    'device_info': {
-                        'name': device_info.name,
-                        'ip_address': device_info.ip_address,
-                        'platform': device_info.platform
-                    }
-                }
-            )))
+            await websocket.send(self._hello_payload())
 
             # Listen for messages from this client
             async for message in websocket:
@@ -191,7 +266,7 @@ class WebSocketClipboardNetwork(NetworkInterface):
                 except websockets.exceptions.ConnectionClosed:
                     break
                 except Exception as e:
-                    print(f"Error handling message from {client_id}: {e}")
+                    logger.warning("Error handling message from %s: %s", client_id, e)
 
         except websockets.exceptions.ConnectionClosed:
             pass
@@ -199,6 +274,7 @@ class WebSocketClipboardNetwork(NetworkInterface):
             # Remove client
             if client_id in self.clients:
                 del self.clients[client_id]
+                self._rebuild_snapshot()
 
             # Notify about device disconnection
             with self._device_lock:
@@ -239,41 +315,40 @@ class WebSocketClipboardNetwork(NetworkInterface):
             clipboard_data = self._deserialize_clipboard_data(packet.data)
             if clipboard_data and self._clipboard_callback:
                 # Check for duplicate data
-                data_id = f"{packet.sender_name}@{packet.sender_ip}:{clipboard_data.timestamp}:{hash(str(clipboard_data.content)[:100])}"
+                content = clipboard_data.content
+                if isinstance(content, str):
+                    content = content.encode('utf-8', 'ignore')
+                # One fixed 16-byte key per entry covering sender, timestamp and content
+                sender = f"{packet.sender_name}@{packet.sender_ip}:{clipboard_data.timestamp}"
+                key = hashlib.blake2b(sender.encode('utf-8'), digest_size=16)
+                key.update(content)
+                data_id = key.digest()
 
                 if data_id not in self._processed_data:
-                    self._processed_data.add(data_id)
+                    self._processed_data[data_id] = None
 
-                    # Clean up old entries
-                    if len(self._processed_data) > 100:
-                        old_entries = list(self._processed_data)[:50]
-                        for entry in old_entries:
-                            self._processed_data.discard(entry)
+                    # Forget the oldest entry
+                    if len(self._processed_data) > MAX_PROCESSED_PACKETS:
+                        self._processed_data.popitem(last=False)
 
                     # Process clipboard data
                     self._clipboard_callback(clipboard_data)
 
-    async def _broadcast_packet(self, packet: NetworkPacket):
-        """Broadcast a packet to all connected clients."""
-        if not self.clients:
-            return
+    def _rebuild_snapshot(self):
+        """Refresh the client snapshot after self.clients changes; runs on the event loop."""
+        self._clients_snapshot = tuple(self.clients.items())
 
-        message = self._serialize_packet(packet)
-        disconnected_clients = []
+    def _broadcast_bytes(self, message: bytes):
+        """Broadcast an already serialized packet to all connected clients."""
+        # Closed connections are skipped without raising; _handle_client removes them from the table
+        websockets.broadcast((websocket for _, websocket in self._clients_snapshot), message)
 
-        for client_id, websocket in self.clients.items():
-            try:
-                await websocket.send(message)
-            except websockets.exceptions.ConnectionClosed:
-                disconnected_clients.append(client_id)
-            except Exception as e:
-                print(f"Error sending to client {client_id}: {e}")
-                disconnected_clients.append(client_id)
-
-        # Remove disconnected clients
-        for client_id in disconnected_clients:
-            if client_id in self.clients:
-                del self.clients[client_id]
+    def _send_broadcast(self, message: bytes):
+        """Broadcast one clipboard packet; runs on the event loop."""
+        try:
+            self._broadcast_bytes(message)
+        except Exception as e:
+            logger.warning("Error broadcasting clipboard packet: %s", e)
 
     async def _run_server(self):
         """Run the WebSocket server."""
@@ -287,11 +362,13 @@ class WebSocketClipboardNetwork(NetworkInterface):
                 close_timeout=10    # Wait 10 seconds for close handshake
             )
             print(f"WebSocket server started on port {self.port}")
+            self._server_ready.set()
 
             # Keep server running
             await self.server.wait_closed()
         except Exception as e:
             print(f"Error running WebSocket server: {e}")
+            self._server_ready.set()  # Do not keep start_listening waiting
         finally:
             if self.server:
                 self.server.close()
@@ -299,7 +376,8 @@ class WebSocketClipboardNetwork(NetworkInterface):
 
     def _run_event_loop(self):
         """Run the asyncio event loop in a separate thread."""
-        self._loop = asyncio.new_event_loop()
+        # Only this thread's loop changes; the process-wide policy is left alone
+        self._loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
         asyncio.set_event_loop(self._loop)
 
         try:
@@ -316,6 +394,7 @@ class WebSocketClipboardNetwork(NetworkInterface):
 
         self._clipboard_callback = clipboard_callback
         self._running = True
+        self._server_ready.clear()
 
         # Start device discovery
         self.discovery.start_discovery(self._on_discovery_event)
@@ -324,8 +403,8 @@ class WebSocketClipboardNetwork(NetworkInterface):
         self._thread = threading.Thread(target=self._run_event_loop, daemon=True)
         self._thread.start()
 
-        # Give server time to start
-        time.sleep(1)
+        # Wait until the server is accepting connections
+        self._server_ready.wait(timeout=5)
 
     def stop_listening(self) -> None:
         """Stop listening for clipboard data."""
@@ -359,10 +438,11 @@ class WebSocketClipboardNetwork(NetworkInterface):
             data=self._serialize_clipboard_data(data)
         )
 
-        # Schedule broadcast in event loop
-        self._loop.call_soon_threadsafe(
-            lambda: asyncio.create_task(self._broadcast_packet(packet))
-        )
+        # Encode on the calling thread so the event loop only does I/O
+        message = self._serialize_packet(packet)
+
+        # Every update is sent, in order, by the event loop
+        self._loop.call_soon_threadsafe(self._send_broadcast, message)
 
     def _on_discovery_event(self, event_type: str, device: DeviceInfo):
         """Handle device discovery events."""
@@ -2,9 +2,11 @@
 from PyQt6.QtWidgets import QWidget, QGraphicsOpacityEffect
 from PyQt6.QtCore import (
     QPropertyAnimation, QEasingCurve, QParallelAnimationGroup,
-    QSequentialAnimationGroup, QRect, QPoint, QTimer, pyqtSignal
+    QSequentialAnimationGroup, QRect, QPoint, QPointF, QTimer, Qt, pyqtSignal
 )
-from PyQt6.QtGui import QPainter, QColor, QPen
+from PyQt6.QtGui import QPainter, QColor, QPen, QBrush, QGradient, QLinearGradient, QPolygonF
+
+PARTICLE_OPACITY_BINS = 8  # Opacity levels particles are drawn with, one draw call each
 
 class FloatingWidget(QWidget):
     """Widget with gentle floating animation effect."""
@@ -189,44 +191,63 @@ class ParticleSystem(QWidget):
     def __init__(self, parent=None, particle_count=20):
         super().__init__(parent)
         self.particle_count = particle_count
-        self.particles = []
+
+        # Structure of arrays: one list per attribute, indexed by particle
+        self.xs = []
+        self.ys = []
+        self.vxs = []
+        self.vys = []
+        self.sizes = []
+        self.opacities = []
+        self._draw_groups = []  # (pen, particle indices) sharing one drawPoints call
         self.setup_particles()
         self.setAttribute(self.__class__.WA_TransparentForMouseEvents)
 
     def setup_particles(self):
         """Setup initial particles."""
         import random
-        for _ in range(self.particle_count):
-            particle = {
-                'x': random.randint(0, self.width() or 800),
-                'y': random.randint(0, self.height() or 600),
-                'vx': random.uniform(-1, 1),
-                'vy': random.uniform(-1, 1),
-                'size': random.uniform(2, 6),
-                'opacity': random.uniform(30, 100)
-            }
-            self.particles.append(particle)
+        count = self.particle_count
+        width = self.width() or 800
+        height = self.height() or 600
+        self.xs = [float(random.randint(0, width)) for _ in range(count)]
+        self.ys = [float(random.randint(0, height)) for _ in range(count)]
+        self.vxs = [random.uniform(-1, 1) for _ in range(count)]
+        self.vys = [random.uniform(-1, 1) for _ in range(count)]
+        self.sizes = [random.uniform(2, 6) for _ in range(count)]
+        self.opacities = [random.uniform(30, 100) for _ in range(count)]
+        self._build_draw_groups()
+
+    def _build_draw_groups(self):
+        """Group particles by opacity bin and size so each group is one pen and one draw call."""
+        groups = {}
+        for i, (size, opacity) in enumerate(zip(self.sizes, self.opacities)):
+            level = min(int((opacity - 30) / 70 * PARTICLE_OPACITY_BINS), PARTICLE_OPACITY_BINS - 1)
+            groups.setdefault((level, round(size)), []).append(i)
+
+        self._draw_groups = []
+        for (level, size), indices in groups.items():
+            alpha = int(30 + (level + 0.5) * 70 / PARTICLE_OPACITY_BINS)
+            pen = QPen(QColor(255, 255, 255, alpha), size)
+            pen.setCapStyle(Qt.PenCapStyle.RoundCap)  # Wide round points look like the filled dots
+            self._draw_groups.append((pen, indices))
 
     def update_particles(self):
         """Update particle positions."""
         import random
-        for particle in self.particles:
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
+        uniform = random.uniform
+        width = self.width() or 800
+        height = self.height() or 600
+        xs, ys, vxs, vys = self.xs, self.ys, self.vxs, self.vys
 
-            # Bounce off walls
-            if particle['x'] <= 0 or particle['x'] >= (self.width() or 800):
-                particle['vx'] *= -1
-            if particle['y'] <= 0 or particle['y'] >= (self.height() or 600):
-                particle['vy'] *= -1
+        for i in range(self.particle_count):
+            x = xs[i] = xs[i] + vxs[i]
+            y = ys[i] = ys[i] + vys[i]
 
-            # Random walk
-            particle['vx'] += random.uniform(-0.1, 0.1)
-            particle['vy'] += random.uniform(-0.1, 0.1)
-
-            # Limit velocity
-            particle['vx'] = max(-2, min(2, particle['vx']))
-            particle['vy'] = max(-2, min(2, particle['vy']))
+            # Bounce off walls, random walk, then limit velocity
+            vx = -vxs[i] if x <= 0 or x >= width else vxs[i]
+            vy = -vys[i] if y <= 0 or y >= height else vys[i]
+            vxs[i] = max(-2, min(2, vx + uniform(-0.1, 0.1)))
+            vys[i] = max(-2, min(2, vy + uniform(-0.1, 0.1)))
 
         self.update()
 
@@ -235,16 +256,13 @@ class ParticleSystem(QWidget):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
-        for particle in self.particles:
-            color = QColor(255, 255, 255, int(particle['opacity']))
-            painter.setPen(QPen(color, 1))
-            painter.setBrush(QBrush(color))
-            painter.drawEllipse(
-                int(particle['x']),
-                int(particle['y']),
-                int(particle['size']),
-                int(particle['size'])
-            )
+        xs, ys, sizes = self.xs, self.ys, self.sizes
+        for pen, indices in self._draw_groups:
+            painter.setPen(pen)
+            # Points are centred where the old dots' bounding boxes were
+            painter.drawPoints(QPolygonF([
+                QPointF(xs[i] + sizes[i] / 2, ys[i] + sizes[i] / 2) for i in indices
+            ]))
 
 class AnimatedBackground(QWidget):
     """Animated gradient background."""
@@ -256,6 +274,9 @@ class AnimatedBackground(QWidget):
 
     def setup_animation(self):
         """Setup gradient animation."""
+        # One gradient per hue offset, relative to the painted rect so resizes need no rebuild
+        self._gradients = [self._make_gradient(offset) for offset in range(360)]
+
         self.animation_timer = QTimer()
         self.animation_timer.timeout.connect(self.update_gradient)
         self.animation_timer.start(50)  # Update every 50ms
@@ -265,25 +286,17 @@ class AnimatedBackground(QWidget):
         self.gradient_offset = (self.gradient_offset + 1) % 360
         self.update()
 
+    @staticmethod
+    def _make_gradient(offset):
+        """Build the diagonal gradient brush for a hue offset."""
+        gradient = QLinearGradient(0, 0, 1, 1)
+        gradient.setCoordinateMode(QGradient.CoordinateMode.ObjectMode)
+        gradient.setColorAt(0, QColor.fromHsv(offset % 360, 70, 90))
+        gradient.setColorAt(1, QColor.fromHsv((offset + 60) % 360, 70, 80))
+        return QBrush(gradient)
+
     def paintEvent(self, event):
         """Paint animated gradient."""
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-
-        # Create animated gradient
-        from PyQt6.QtGui import QLinearGradient
-        gradient = QLinearGradient(0, 0, self.width(), self.height())
-
-        # Animated color stops
-        import math
-        hue1 = (self.gradient_offset) % 360
-        hue2 = (self.gradient_offset + 60) % 360
-
-        from PyQt6.QtGui import QColor
-        color1 = QColor.fromHsv(hue1, 70, 90)
-        color2 = QColor.fromHsv(hue2, 70, 80)
-
-        gradient.setColorAt(0, color1)
-        gradient.setColorAt(1, color2)
-
-        painter.fillRect(self.rect(), gradient)
\ No newline at end of file
+        painter.fillRect(self.rect(), self._gradients[self.gradient_offset])
@@ -4,11 +4,18 @@ from tkinter import ttk, scrolledtext, messagebox
 from PIL import Image, ImageTk
 import threading
 import time
+import hashlib
+from collections import OrderedDict
 from datetime import datetime
+from io import BytesIO
 
 from core.clipboard_manager import ClipboardManager
 from interfaces import ClipboardType, DeviceInfo
 
+MAX_THUMBS = 128  # Decoded history thumbnails kept for reuse
+REPAINT_TICK_MS = 100  # How often the GUI thread checks for history/device changes
+DEVICE_TICK_MS = 5000  # Refreshes the devices' "last seen" status
+
 class ClipboardApp:
     """Main application UI."""
 
@@ -24,15 +31,31 @@ class ClipboardApp:
         # Device list storage
         self.connected_devices: list[DeviceInfo] = []
 
+        # History rows currently shown, keyed by _history_keys, newest first
+        self._row_widgets: dict[tuple, ttk.Frame] = {}
+        self._row_order: list[tuple] = []
+        self._failed_rows: set[tuple] = set()  # Rows whose thumbnail failed; rebuilt on repaint
+
+        # Thumbnails by (file path, timestamp) or content digest, least recently used first
+        self._thumb_cache: OrderedDict[object, ImageTk.PhotoImage] = OrderedDict()
+
+        # Set by manager callbacks on other threads; only the GUI thread touches Tk
+        self._history_dirty = False
+        self._devices_dirty = False
+        self._device_status = None  # Pending status bar message from a device event
+
         # Setup UI
         self.setup_ui()
 
-        # Setup device callback
+        # Setup manager callbacks
         self.manager.add_device_callback(self.on_device_event)
+        self.manager.add_history_callback(self._on_history_changed)
 
-        # Start UI update loops
+        # Initial paint, then repaint only on events plus a slow tick for device status
         self.update_ui()
         self.update_devices()
+        self.root.after(REPAINT_TICK_MS, self._flush_repaint)
+        self.root.after(DEVICE_TICK_MS, self._device_tick)
 
         # Handle window closing
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -144,10 +167,21 @@ class ClipboardApp:
         status_bar = ttk.Label(main_frame, textvariable=self.status_var, relief=tk.SUNKEN)
         status_bar.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(10, 0))
 
-    def create_history_item(self, data, index):
-        """Create a UI item for clipboard data."""
+    @staticmethod
+    def _history_keys(entries):
+        """Stable, unique identities of history entries (oldest first) across refreshes."""
+        counts = {}
+        keys = []
+        for data in entries:
+            key = (data.timestamp, data.device_name, data.type, hash(data.content))
+            # Identical entries are told apart by how many copies precede them
+            counts[key] = count = counts.get(key, -1) + 1
+            keys.append(key + (count,))
+        return keys
+
+    def create_history_item(self, data, index, key):
+        """Create a UI item for clipboard data; the caller packs the returned frame."""
         frame = ttk.Frame(self.scrollable_frame, relief=tk.RIDGE, borderwidth=1)
-        frame.pack(fill=tk.X, padx=5, pady=5)
 
         # Device and time
         header_frame = ttk.Frame(frame)
@@ -180,17 +214,7 @@ class ClipboardApp:
 
             # Small thumbnail
             try:
-                if isinstance(data.content, str) and data.content.endswith('.png'):
-                    # Load from file
-                    image = Image.open(data.content)
-                else:
-                    # Load from bytes
-                    from io import BytesIO
-                    image = Image.open(BytesIO(data.content))
-
-                # Create thumbnail
-                image.thumbnail((100, 100), Image.Resampling.LANCZOS)
-                photo = ImageTk.PhotoImage(image)
+                photo = self._get_thumbnail(data)
 
                 img_label = ttk.Label(type_frame, image=photo)
                 img_label.pack(side=tk.LEFT, padx=(10, 0))
@@ -198,12 +222,45 @@ class ClipboardApp:
             except Exception as e:
                 error_label = ttk.Label(type_frame, text="[无法加载图片]", foreground="red")
                 error_label.pack(side=tk.LEFT, padx=(10, 0))
+                self._failed_rows.add(key)
 
         # Copy button
         copy_btn = ttk.Button(frame, text="复制到剪贴板",
                              command=lambda d=data: self.copy_to_clipboard(d))
         copy_btn.pack(side=tk.RIGHT, padx=5, pady=5)
 
+        return frame
+
+    def _get_thumbnail(self, data) -> ImageTk.PhotoImage:
+        """Get the 100x100 thumbnail for image content, decoding it only on first use."""
+        content = data.content
+        if isinstance(content, str):
+            # Saved file names only have second resolution, so the path alone can repeat
+            key = (content, data.timestamp)
+        else:
+            key = hashlib.blake2b(content, digest_size=16).digest()
+
+        photo = self._thumb_cache.get(key)
+        if photo is not None:
+            self._thumb_cache.move_to_end(key)
+            return photo
+
+        if isinstance(content, str) and content.endswith('.png'):
+            # Load from file
+            image = Image.open(content)
+        else:
+            # Load from bytes
+            image = Image.open(BytesIO(content))
+
+        # Create thumbnail
+        image.thumbnail((100, 100), Image.Resampling.LANCZOS)
+        photo = ImageTk.PhotoImage(image)
+
+        self._thumb_cache[key] = photo
+        if len(self._thumb_cache) > MAX_THUMBS:
+            self._thumb_cache.popitem(last=False)
+        return photo
+
     def create_device_item(self, device: DeviceInfo):
         """Create a UI item for a connected device."""
         frame = ttk.Frame(self.device_frame_inner, relief=tk.RIDGE, borderwidth=1)
@@ -274,15 +331,41 @@ class ClipboardApp:
         # Update device count
         self.device_count_var.set(f"({len(devices)})")
 
-        # Schedule next update
-        self.root.after(2000, self.update_devices)  # Update devices every 2 seconds
+    def _device_tick(self):
+        """Refresh device status so "last seen" stays current, and retry failed thumbnails."""
+        if self._failed_rows:
+            self._history_dirty = True
+        self.update_devices()
+        self.root.after(DEVICE_TICK_MS, self._device_tick)
+
+    def _on_history_changed(self):
+        """Mark the history stale; called from manager threads."""
+        self._history_dirty = True
+
+    def _flush_repaint(self):
+        """Repaint whatever changed since the last tick; runs on the GUI thread."""
+        # Clear each flag before repainting so a change arriving meanwhile is kept
+        if self._history_dirty:
+            self._history_dirty = False
+            self.update_ui()
+        if self._devices_dirty:
+            self._devices_dirty = False
+            self.update_devices()
+
+        status, self._device_status = self._device_status, None
+        if status:
+            self.status_var.set(status)
+
+        self.root.after(REPAINT_TICK_MS, self._flush_repaint)
 
     def on_device_event(self, event_type: str, device: DeviceInfo):
-        """Handle device join/leave events."""
+        """Handle device join/leave events; called from manager threads."""
         if event_type == 'device_joined':
-            self.status_var.set(f"设备 {device.name} 已加入")
+            self._device_status = f"设备 {device.name} 已加入"
         elif event_type == 'device_left':
-            self.status_var.set(f"设备 {device.name} 已离开")
+            self._device_status = f"设备 {device.name} 已离开"
+
+        self._devices_dirty = True
 
     def refresh_devices(self):
         """Trigger device discovery."""
@@ -291,21 +374,34 @@ class ClipboardApp:
 
     def update_ui(self):
         """Update the UI with current history."""
-        # Clear existing items
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-
-        # Add current history items
         history = self.manager.get_history()
-        for i, data in enumerate(reversed(history)):
-            self.create_history_item(data, i)
+        entries = list(reversed(history))
+        keys = list(reversed(self._history_keys(history)))
+
+        # Only touch widgets when the history actually changed
+        if keys != self._row_order or self._failed_rows:
+            # Rows whose thumbnail failed are rebuilt rather than kept
+            wanted = set(keys) - self._failed_rows
+            self._failed_rows.clear()
+            for key in self._row_order:
+                if key not in wanted:
+                    self._row_widgets.pop(key).destroy()
+
+            for i, (key, data) in enumerate(zip(keys, entries)):
+                if key not in self._row_widgets:
+                    self._row_widgets[key] = self.create_history_item(data, i, key)
+
+            # Re-pack in the new order; existing rows are moved, not rebuilt
+            for key in keys:
+                self._row_widgets[key].pack_forget()
+            for key in keys:
+                self._row_widgets[key].pack(fill=tk.X, padx=5, pady=5)
+
+            self._row_order = keys
 
         # Update status
         self.status_var.set(f"运行中... {len(history)} 条历史记录")
 
-        # Schedule next update
-        self.root.after(1000, self.update_ui)
-
     def copy_to_clipboard(self, data):
         """Copy data to clipboard."""
         try:
@@ -333,8 +429,7 @@ class ClipboardApp:
     def clear_history(self):
         """Clear clipboard history."""
         if messagebox.askyesno("确认清空", "确定要清空所有剪贴板历史记录吗？\n此操作不可恢复。"):
-            self.manager.clear_history()
-            self.update_ui()  # Refresh UI to show empty history
+            self.manager.clear_history()  # History callback repaints the list
 
     def on_closing(self):
         """Handle window closing."""
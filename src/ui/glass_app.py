@@ -2,7 +2,7 @@
 import sys
 import time
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 from dataclasses import dataclass
 
 from PyQt6.QtWidgets import (
@@ -372,6 +372,11 @@ class DeviceItem(LiquidGlassWidget):
 class ModernClipboardApp(QMainWindow):
     """Modern PyQt6 main application with liquid glass UI."""
 
+    # Emitted from manager threads; Qt queues them onto the GUI thread
+    history_changed = pyqtSignal()
+    devices_changed = pyqtSignal()
+    status_changed = pyqtSignal(str)
+
     def __init__(self):
         super().__init__()
 
@@ -381,16 +386,25 @@ class ModernClipboardApp(QMainWindow):
         # Device list storage
         self.connected_devices: List[DeviceInfo] = []
 
+        # History items currently shown, keyed by _history_keys, newest first
+        self._row_widgets: Dict[tuple, ClipboardHistoryItem] = {}
+        self._row_order: List[tuple] = []
+
         # Setup window
         self.setup_window()
         self.setup_ui()
 
-        # Setup device callback
-        self.manager.add_device_callback(self.on_device_event)
-
         # Start update timers
         self.setup_timers()
 
+        # Setup manager callbacks
+        self.manager.add_device_callback(self.on_device_event)
+        self.manager.add_history_callback(self.history_changed.emit)
+
+        # Initial paint once callbacks are registered, so no event falls in between
+        self.update_ui()
+        self.update_devices()
+
     def setup_window(self):
         """Setup main window properties."""
         self.setWindowTitle("🔗 SyncClip - 液态玻璃剪贴板同步")
@@ -600,34 +614,73 @@ class ModernClipboardApp(QMainWindow):
 
     def setup_timers(self):
         """Setup update timers."""
-        # UI update timer
+        # History repaints are event driven; bursts collapse into one update
         self.ui_timer = QTimer()
+        self.ui_timer.setSingleShot(True)
+        self.ui_timer.setInterval(50)
         self.ui_timer.timeout.connect(self.update_ui)
-        self.ui_timer.start(1000)  # Update every second
+        self.history_changed.connect(self.ui_timer.start)
+
+        # Device events repaint the same way
+        self.device_event_timer = QTimer()
+        self.device_event_timer.setSingleShot(True)
+        self.device_event_timer.setInterval(50)
+        self.device_event_timer.timeout.connect(self.update_devices)
+        self.devices_changed.connect(self.device_event_timer.start)
 
-        # Device update timer
+        # Status text from manager threads is applied on the GUI thread
+        self.status_changed.connect(self.status_label.setText)
+
+        # Slow tick only to keep "last seen" status current
         self.device_timer = QTimer()
         self.device_timer.timeout.connect(self.update_devices)
-        self.device_timer.start(2000)  # Update every 2 seconds
+        self.device_timer.start(5000)  # Update every 5 seconds
+
+    @staticmethod
+    def _history_keys(entries: List[ClipboardData]) -> List[tuple]:
+        """Stable, unique identities of history entries (oldest first) across refreshes."""
+        counts = {}
+        keys = []
+        for data in entries:
+            key = (data.timestamp, data.device_name, data.type, hash(data.content))
+            # Identical entries are told apart by how many copies precede them
+            counts[key] = count = counts.get(key, -1) + 1
+            keys.append(key + (count,))
+        return keys
 
     def update_ui(self):
         """Update the clipboard history UI."""
-        # Clear existing items (keep the stretch at the end)
-        while self.history_layout.count() > 1:
-            item = self.history_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-
-        # Add current history items with staggered animations
         history = self.manager.get_history()
-        for i, data in enumerate(reversed(history[-20:])):  # Show last 20 items
-            item = ClipboardHistoryItem(data)
-            item.copy_clicked.connect(self.copy_to_clipboard)
-            self.history_layout.insertWidget(self.history_layout.count() - 1, item)
-
-            # Staggered fade-in for each item
-            delay = i * 100  # 100ms delay between each item
-            FadeInAnimation.fade_in(item, duration=600, delay=delay)
+        entries = list(reversed(history[-20:]))  # Show last 20 items
+        keys = list(reversed(self._history_keys(history)[-20:]))
+
+        # Only touch widgets when the history actually changed
+        if keys != self._row_order:
+            wanted = set(keys)
+            for key in self._row_order:
+                if key not in wanted:
+                    item = self._row_widgets.pop(key)
+                    self.history_layout.removeWidget(item)
+                    item.deleteLater()
+
+            new_items = 0
+            for index, (key, data) in enumerate(zip(keys, entries)):
+                item = self._row_widgets.get(key)
+                if item is None:
+                    item = ClipboardHistoryItem(data)
+                    item.copy_clicked.connect(self.copy_to_clipboard)
+                    self._row_widgets[key] = item
+                    self.history_layout.insertWidget(index, item)
+
+                    # Staggered fade-in, only for items that are new
+                    FadeInAnimation.fade_in(item, duration=600, delay=new_items * 100)
+                    new_items += 1
+                elif self.history_layout.indexOf(item) != index:
+                    # Existing items are moved, not rebuilt (the stretch stays last)
+                    self.history_layout.removeWidget(item)
+                    self.history_layout.insertWidget(index, item)
+
+            self._row_order = keys
 
         # Update counts
         self.history_count_label.setText(f"({len(history)})")
@@ -660,9 +713,11 @@ class ModernClipboardApp(QMainWindow):
     def on_device_event(self, event_type: str, device: DeviceInfo):
         """Handle device join/leave events."""
         if event_type == 'device_joined':
-            self.status_label.setText(f"✅ 设备 {device.name} 已加入")
+            self.status_changed.emit(f"✅ 设备 {device.name} 已加入")
         elif event_type == 'device_left':
-            self.status_label.setText(f"❌ 设备 {device.name} 已离开")
+            self.status_changed.emit(f"❌ 设备 {device.name} 已离开")
+
+        self.devices_changed.emit()
 
     def refresh_devices(self):
         """Trigger device discovery."""
@@ -704,8 +759,7 @@ class ModernClipboardApp(QMainWindow):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            self.manager.clear_history()
-            self.update_ui()
+            self.manager.clear_history()  # History callback repaints the list
 
     def closeEvent(self, event):
         """Handle window closing."""
@@ -5,7 +5,6 @@ import sys
 import os
 import time
 import threading
-from datetime import datetime
 
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
@@ -25,13 +24,13 @@ def single_device_test():
         def on_clipboard_data(self, data):
             """Handle received clipboard data."""
             self.clipboard_data_received.append(data)
-            timestamp = datetime.now().strftime("%H:%M:%S")
+            timestamp = time.strftime("%H:%M:%S")
             print(f"[{self.name}][{timestamp}] Received clipboard data from {data.device_name}")
 
         def on_device_event(self, event_type, device):
             """Handle device events."""
             self.device_events.append((event_type, device))
-            timestamp = datetime.now().strftime("%H:%M:%S")
+            timestamp = time.strftime("%H:%M:%S")
             print(f"[{self.name}][{timestamp}] Device {event_type}: {device.name} ({device.ip_address}) - {device.platform}")
 
     print("=== Single Device Network Test ===")
@@ -62,9 +61,10 @@ def single_device_test():
             print(f"Running... {i}s. Connected devices: {len(network.get_connected_devices())}")
 
             # Show current devices
+            now = time.time()
             devices = network.get_connected_devices()
             for device in devices:
-                last_seen = time.time() - device.last_seen
+                last_seen = now - device.last_seen
                 print(f"  - {device.name} ({device.ip_address}) [{device.platform}] - Last seen: {last_seen:.1f}s ago")
 
             # Trigger discovery every 10 seconds
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Tests for ClipboardManager's history and image persistence."""
+
+import sys
+import os
+import tempfile
+from unittest import mock
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.clipboard_manager import ClipboardManager
+from interfaces import ClipboardData, ClipboardType
+
+IMAGE = b'\x89PNG\r\n\x1a\n' + bytes(range(256)) * 4
+
+def make_manager(data_dir):
+    """A manager whose monitor and network are mocks, so no threads or sockets start."""
+    with mock.patch('core.clipboard_manager.CrossPlatformClipboardMonitor'), \
+            mock.patch('core.clipboard_manager.UDPClipboardNetwork'):
+        return ClipboardManager(data_dir=data_dir)
+
+def pause_writer(manager):
+    """Stop the background writer so queued writes run only in run_writer()."""
+    manager._write_queue.put(None)
+    manager._writer_thread.join(timeout=5)
+
+def run_writer(manager):
+    """Process everything queued so far on the calling thread."""
+    manager._write_queue.put(None)
+    manager._writer_loop()
+
+def image_data(timestamp=1700000000.0, device_name="host-b"):
+    return ClipboardData(IMAGE, ClipboardType.IMAGE, timestamp, device_name)
+
+def test_image_path_published_after_write():
+    with tempfile.TemporaryDirectory() as data_dir:
+        manager = make_manager(data_dir)
+        pause_writer(manager)
+
+        manager._on_network_clipboard_receive(image_data())
+        assert manager.get_history()[0].content == IMAGE  # Bytes until the file exists
+
+        run_writer(manager)
+        path = manager.get_history()[0].content
+        assert path == os.path.join(data_dir, "host-b_1700000000.png")
+        with open(path, 'rb') as f:
+            assert f.read() == IMAGE
+
+def test_clear_history_voids_pending_writes():
+    with tempfile.TemporaryDirectory() as data_dir:
+        manager = make_manager(data_dir)
+        pause_writer(manager)
+
+        manager._on_network_clipboard_receive(image_data())
+        manager.clear_history()
+        run_writer(manager)
+
+        assert manager.get_history() == []
+        assert os.listdir(data_dir) == []
+
+def test_writes_after_clear_are_kept():
+    with tempfile.TemporaryDirectory() as data_dir:
+        manager = make_manager(data_dir)
+        pause_writer(manager)
+
+        manager._on_network_clipboard_receive(image_data(1.0))
+        manager.clear_history()
+        manager._on_network_clipboard_receive(image_data(2.0))
+        run_writer(manager)
+
+        assert os.listdir(data_dir) == ["host-b_2.png"]
+        assert [data.timestamp for data in manager.get_history()] == [2.0]
+
+def test_echo_of_local_change_is_dropped():
+    """A peer sending back what this device just copied is not added twice."""
+    with tempfile.TemporaryDirectory() as data_dir:
+        manager = make_manager(data_dir)
+        local = ClipboardData("copied here", ClipboardType.TEXT, 1.0, "host-a")
+
+        manager._on_local_clipboard_change(local)
+        manager.network.broadcast_clipboard.assert_called_once_with(local)
+
+        manager._on_network_clipboard_receive(
+            ClipboardData("copied here", ClipboardType.TEXT, 1.5, "host-b")
+        )
+        assert [data.content for data in manager.get_history()] == ["copied here"]
+
+def test_new_network_content_is_kept():
+    with tempfile.TemporaryDirectory() as data_dir:
+        manager = make_manager(data_dir)
+        manager._on_local_clipboard_change(
+            ClipboardData("copied here", ClipboardType.TEXT, 1.0, "host-a")
+        )
+
+        manager._on_network_clipboard_receive(
+            ClipboardData("copied there", ClipboardType.TEXT, 2.0, "host-b")
+        )
+        assert [data.content for data in manager.get_history()] == ["copied here", "copied there"]
+        manager.network.broadcast_clipboard.assert_called_once()  # Received data is not re-sent
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"{name}: ok")
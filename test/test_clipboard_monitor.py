@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Tests for the clipboard monitor's change detection and checksums."""
+
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from platforms.clipboard_monitor import (
+    CrossPlatformClipboardMonitor, clipboard_checksum, LARGE_PAYLOAD_THRESHOLD, SAMPLE_SIZE
+)
+from interfaces import ClipboardData, ClipboardType
+
+class FakeClipboard:
+    """Stands in for the OS change counter and text clipboard."""
+
+    def __init__(self):
+        self.count = 1
+        self.text = ""
+        self.busy = False
+        self.reads = 0
+
+    def paste(self):
+        self.reads += 1
+        if self.busy:
+            raise OSError("clipboard is busy")
+        return self.text
+
+    def copy(self, text):
+        self.text = text
+        self.count += 1
+
+def make_monitor(clipboard):
+    monitor = CrossPlatformClipboardMonitor()
+    monitor._change_counter = lambda: clipboard.count
+    monitor._grab_image = lambda: None
+    monitor._paste = clipboard.paste
+    received = []
+    monitor._callback = received.append
+    return monitor, received
+
+def poll(monitor):
+    """One _monitor_loop tick, including its error handling."""
+    try:
+        monitor._poll()
+    except Exception:
+        monitor._last_change_count = None
+
+def test_unchanged_count_skips_read():
+    clipboard = FakeClipboard()
+    monitor, received = make_monitor(clipboard)
+    clipboard.copy("hello")
+
+    poll(monitor)
+    assert [data.content for data in received] == ["hello"]
+
+    reads = clipboard.reads
+    for _ in range(5):
+        poll(monitor)
+    assert clipboard.reads == reads
+    assert len(received) == 1
+
+def test_empty_clipboard_keeps_count():
+    """An idle, empty clipboard is read once, not on every tick."""
+    clipboard = FakeClipboard()
+    monitor, received = make_monitor(clipboard)
+
+    for _ in range(5):
+        poll(monitor)
+    assert clipboard.reads == 1
+    assert received == []
+
+def test_failed_read_is_retried():
+    """A change seen while the clipboard is busy is picked up once it frees up."""
+    clipboard = FakeClipboard()
+    monitor, received = make_monitor(clipboard)
+    clipboard.copy("copied while busy")
+    clipboard.busy = True
+
+    poll(monitor)
+    assert received == []
+
+    clipboard.busy = False
+    poll(monitor)
+    assert [data.content for data in received] == ["copied while busy"]
+
+def test_same_content_is_not_reported_twice():
+    clipboard = FakeClipboard()
+    monitor, received = make_monitor(clipboard)
+
+    clipboard.copy("same")
+    poll(monitor)
+    clipboard.copy("same")
+    poll(monitor)
+    assert len(received) == 1
+
+def image(content):
+    return ClipboardData(content, ClipboardType.IMAGE, 1.0, "host-a")
+
+def test_checksum_detects_small_changes():
+    content = bytearray(1000)
+    before = clipboard_checksum(image(bytes(content)))
+    content[500] = 1
+    assert clipboard_checksum(image(bytes(content))) != before
+
+def test_checksum_matches_text_and_its_utf8_bytes():
+    text = ClipboardData("你好", ClipboardType.TEXT, 1.0, "host-a")
+    assert clipboard_checksum(text) == clipboard_checksum(image("你好".encode('utf-8')))
+
+def test_large_payload_checksum_samples_head_and_tail():
+    """Over the threshold only the head, tail and length are checksummed."""
+    size = LARGE_PAYLOAD_THRESHOLD + 10 * SAMPLE_SIZE
+    content = bytearray(size)
+    before = clipboard_checksum(image(bytes(content)))
+
+    content[size // 2] = 1  # Middle edits are not sampled
+    assert clipboard_checksum(image(bytes(content))) == before
+
+    content[0] = 1
+    head = clipboard_checksum(image(bytes(content)))
+    assert head != before
+
+    content[-1] = 1
+    assert clipboard_checksum(image(bytes(content))) != head
+
+    assert clipboard_checksum(image(bytes(size + 1))) != before  # Length is included
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"{name}: ok")
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Tests for the hook-creator skill scripts."""
+
+import sys
+import os
+import tempfile
+import yaml
+
+# Add the hook-creator scripts directory to path
+sys.path.insert(0, os.path.join(
+    os.path.dirname(__file__), '..', '.claude', 'skills', 'hook-creator', 'scripts'
+))
+
+import validate_hook
+from validate_hook import HookValidator, load_hooks_config
+from create_hook import create_hook_config, render_hooks_yaml, update_hooks_yaml
+
+HOOKS = """hooks:
+  - name: check
+    event: before
+    command: echo ok
+"""
+
+def write(path, text, mtime_ns=None):
+    with open(path, 'w') as f:
+        f.write(text)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+def test_unchanged_file_reuses_parse():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "hooks.yaml")
+        write(path, HOOKS)
+
+        config = load_hooks_config(path)
+        assert config['hooks'][0]['name'] == "check"
+        assert load_hooks_config(path) is config
+        assert os.path.abspath(path) in validate_hook.PARSE_CACHE
+
+def test_size_change_invalidates_cache():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "hooks.yaml")
+        write(path, HOOKS, mtime_ns=1_000_000_000)
+        load_hooks_config(path)
+
+        write(path, HOOKS.replace("check", "check-longer"), mtime_ns=1_000_000_000)
+        assert load_hooks_config(path)['hooks'][0]['name'] == "check-longer"
+
+def test_mtime_change_invalidates_cache():
+    """Same-size edits are caught by the modification time."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "hooks.yaml")
+        write(path, HOOKS, mtime_ns=1_000_000_000)
+        load_hooks_config(path)
+
+        write(path, HOOKS.replace("check", "chekk"), mtime_ns=2_000_000_000)
+        assert load_hooks_config(path)['hooks'][0]['name'] == "chekk"
+
+def test_validator_uses_current_contents():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "hooks.yaml")
+        write(path, HOOKS, mtime_ns=1_000_000_000)
+        assert HookValidator().validate_hooks_file(path)
+
+        write(path, HOOKS.replace("before", "never"), mtime_ns=2_000_000_000)
+        validator = HookValidator()
+        assert not validator.validate_hooks_file(path)
+        assert "Invalid event 'never'" in validator.errors[0]
+
+# Values a hand-written emitter can easily get wrong
+TRICKY_STRINGS = [
+    "plain", "", "  padded  ", "yes", "no", "null", "~", "1.5", "0x10", "- item",
+    "#comment", "key: value", "quote\"s", "back\\slash", "tab\there", "中文 ✅",
+    "\x07bell", "\ufeffbom", "a\u00a0b", "a\x85b", "a\u2028b", "a\u2029b", "😀",
+]
+
+def test_emitter_round_trips_through_safe_load():
+    for value in TRICKY_STRINGS:
+        config = {'hooks': [{
+            'name': value,
+            'event': 'before',
+            'enabled': False,
+            'timeout': 30,
+            'conditions': {'file_pattern': value, 'file_size': '1MB'}
+        }]}
+        rendered = render_hooks_yaml(config)
+        assert rendered is not None
+        assert yaml.safe_load(rendered) == config, repr(value)
+
+def test_emitter_defers_unsupported_values():
+    """Multi-line strings, lists and odd keys are left to the full dumper."""
+    for hook in (
+        {'name': 'x', 'command': 'line one\nline two'},
+        {'name': 'x', 'tools': ['bash', 'git']},
+        {'name': 'x', 'odd key': 1},
+        {'name': 'x', 'conditions': {}},
+    ):
+        assert render_hooks_yaml({'hooks': [hook]}) is None
+    assert render_hooks_yaml({'hooks': [], 'version': 1}) is None
+    assert yaml.safe_load(render_hooks_yaml({'hooks': []})) == {'hooks': []}
+
+def test_update_hooks_yaml_round_trips():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "hooks.yaml")
+        first = create_hook_config("lint", "before", tool="bash", command="./lint.sh")
+        multi_line = create_hook_config("notes", "after", command="echo one\necho two")
+
+        update_hooks_yaml([first, multi_line], path)
+        update_hooks_yaml(create_hook_config("lint", "after", timeout=10), path)
+
+        with open(path) as f:
+            hooks = yaml.safe_load(f)['hooks']
+        assert hooks == [create_hook_config("lint", "after", timeout=10), multi_line]
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"{name}: ok")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Tests for the skill-creator packaging script."""
+
+import sys
+import os
+import tempfile
+import zipfile
+
+# Add the skill-creator scripts directory to path
+sys.path.insert(0, os.path.join(
+    os.path.dirname(__file__), '..', '.claude', 'skills', 'skill-creator', 'scripts'
+))
+
+from package_skill import package_skill, STORE_THRESHOLD
+
+SKILL_MD = """---
+name: demo-skill
+description: A skill used to test packaging.
+---
+
+# Demo
+"""
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+
+def build_skill(tmp):
+    skill = os.path.join(tmp, "demo-skill")
+    write(os.path.join(skill, "SKILL.md"), SKILL_MD.encode())
+    write(os.path.join(skill, "scripts", "small.py"), b"print('hi')\n")
+    write(os.path.join(skill, "references", "large.md"), b"repeated line\n" * STORE_THRESHOLD)
+    write(os.path.join(skill, "references", "edge.md"), b"x" * STORE_THRESHOLD)
+    write(os.path.join(skill, "scripts", "__pycache__", "small.cpython-312.pyc"), b"\0")
+    return skill
+
+def test_small_files_stored_large_files_deflated():
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = package_skill(build_skill(tmp), os.path.join(tmp, "dist"))
+        assert archive is not None
+
+        with zipfile.ZipFile(archive) as zipf:
+            types = {info.filename: info.compress_type for info in zipf.infolist()}
+        assert types == {
+            "demo-skill/SKILL.md": zipfile.ZIP_STORED,
+            "demo-skill/scripts/small.py": zipfile.ZIP_STORED,
+            "demo-skill/references/large.md": zipfile.ZIP_DEFLATED,
+            "demo-skill/references/edge.md": zipfile.ZIP_DEFLATED,  # Threshold is exclusive
+        }
+
+def test_packaged_files_round_trip():
+    with tempfile.TemporaryDirectory() as tmp:
+        skill = build_skill(tmp)
+        archive = package_skill(skill, os.path.join(tmp, "dist"))
+
+        with zipfile.ZipFile(archive) as zipf:
+            assert zipf.testzip() is None
+            for name in zipf.namelist():
+                with open(os.path.join(tmp, name), 'rb') as f:
+                    assert zipf.read(name) == f.read(), name
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"{name}: ok")
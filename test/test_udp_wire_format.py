@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""Round-trip tests for the UDP backend's wire formats."""
+
+import sys
+import os
+import time
+import base64
+import random
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from platforms.network import (
+    UDPClipboardNetwork, FRAME_MAGIC, FRAME_HEADER, CONTROL_FRAME, CONTROL_CODES,
+    CONTROL_MULTICAST, MAX_DATAGRAM_SIZE
+)
+from platforms.compression import COMPRESS_THRESHOLD, ENCODINGS
+from interfaces import ClipboardData, ClipboardType, NetworkPacket
+
+def make_network(name="host-a", ip="192.168.1.10"):
+    """Create a network with a fixed identity, without opening any sockets."""
+    network = UDPClipboardNetwork()
+    network.device_name = name
+    network.device_ip = ip
+    network._build_control_packets()
+    return network
+
+def clipboard_packet(network, data):
+    return NetworkPacket(
+        packet_type="clipboard_data",
+        sender_name=network.device_name,
+        sender_ip=network.device_ip,
+        timestamp=time.time(),
+        data=network._serialize_clipboard_data(data)
+    )
+
+def control_bytes(network, packet_type):
+    """Capture the bytes _broadcast_control would send."""
+    sent = []
+    network._broadcast_bytes = sent.append
+    network._broadcast_control(packet_type)
+    return sent[0]
+
+def is_own(network, wire):
+    network._recv_buffer[:len(wire)] = wire
+    return network._is_own_packet(len(wire))
+
+def test_text_round_trip():
+    """Text clipboard packets travel as JSON and decode unchanged."""
+    sender, receiver = make_network(), make_network("host-b", "192.168.1.11")
+    data = ClipboardData("你好, world", ClipboardType.TEXT, 1700000000.5, "测试设备")
+
+    wire = sender._serialize_packet(clipboard_packet(sender, data))
+    assert wire[:4] != FRAME_MAGIC
+
+    packet = receiver._deserialize_packet(wire)
+    assert packet.packet_type == "clipboard_data"
+    assert (packet.sender_name, packet.sender_ip) == ("host-a", "192.168.1.10")
+    assert receiver._deserialize_clipboard_data(packet.data) == data
+
+def test_image_frame_round_trip():
+    """Image bytes travel raw after the frame header and JSON metadata."""
+    sender, receiver = make_network(), make_network("host-b", "192.168.1.11")
+    image = bytes(range(256)) * 40
+    data = ClipboardData(image, ClipboardType.IMAGE, 1700000000.25, "host-a")
+
+    wire = sender._serialize_packet(clipboard_packet(sender, data))
+    magic, _, _, _, meta_len, payload_len = FRAME_HEADER.unpack_from(wire)
+    assert magic == FRAME_MAGIC
+    assert payload_len == len(image)
+    assert wire[FRAME_HEADER.size + meta_len:] == image
+
+    packet = receiver._deserialize_packet(memoryview(wire))
+    assert receiver._deserialize_clipboard_data(packet.data) == data
+
+def test_large_image_is_compressed_into_one_datagram():
+    """Compressible images over the UDP limit shrink to fit, flagged in the frame header."""
+    sender, receiver = make_network(), make_network("host-b", "192.168.1.11")
+    image = bytes(range(256)) * 1024
+    data = ClipboardData(image, ClipboardType.IMAGE, 1700000000.25, "host-a")
+    assert len(image) > MAX_DATAGRAM_SIZE
+
+    wire = sender._serialize_packet(clipboard_packet(sender, data))
+    _, _, flags, _, _, _ = FRAME_HEADER.unpack_from(wire)
+    assert ENCODINGS[flags] is not None
+    assert len(wire) <= MAX_DATAGRAM_SIZE
+
+    packet = receiver._deserialize_packet(wire)
+    assert receiver._deserialize_clipboard_data(packet.data) == data
+
+def test_large_text_is_compressed():
+    sender, receiver = make_network(), make_network("host-b", "192.168.1.11")
+    data = ClipboardData("同步 clipboard " * 10000, ClipboardType.TEXT, 1700000000.5, "host-a")
+
+    wire = sender._serialize_packet(clipboard_packet(sender, data))
+    assert wire[:4] == FRAME_MAGIC
+
+    packet = receiver._deserialize_packet(wire)
+    assert receiver._deserialize_clipboard_data(packet.data) == data
+
+def test_incompressible_payload_is_sent_raw():
+    sender, receiver = make_network(), make_network("host-b", "192.168.1.11")
+    image = random.Random(0).randbytes(COMPRESS_THRESHOLD * 2)
+    data = ClipboardData(image, ClipboardType.IMAGE, time.time(), "host-a")
+
+    packet_data = sender._serialize_clipboard_data(data)
+    assert 'enc' not in packet_data
+
+    wire = sender._serialize_packet(clipboard_packet(sender, data))
+    assert FRAME_HEADER.unpack_from(wire)[2] == 0
+    packet = receiver._deserialize_packet(wire)
+    assert receiver._deserialize_clipboard_data(packet.data) == data
+
+def test_truncated_frame_is_rejected():
+    sender, receiver = make_network(), make_network("host-b", "192.168.1.11")
+    data = ClipboardData(b'\x89PNG' * 100, ClipboardType.IMAGE, time.time(), "host-a")
+
+    wire = sender._serialize_packet(clipboard_packet(sender, data))
+    assert receiver._deserialize_packet(wire[:-10]) is None
+
+def test_base64_image_from_older_peer():
+    """Images sent base64-encoded inside JSON by older builds still decode."""
+    receiver = make_network("host-b", "192.168.1.11")
+    image = b'\x89PNG\r\n\x1a\n' + bytes(500)
+    packet_data = {
+        'content': base64.b64encode(image).decode('ascii'),
+        'type': ClipboardType.IMAGE.value,
+        'timestamp': 1700000000.0,
+        'device_name': "old-host"
+    }
+    assert receiver._deserialize_clipboard_data(packet_data).content == image
+
+def test_control_frame_round_trip():
+    """Control packets use the fixed struct layout and carry the multicast flag."""
+    sender, receiver = make_network(), make_network("host-b", "192.168.1.11")
+
+    for multicast in (False, True):
+        sender._multicast_joined = multicast
+        wire = control_bytes(sender, "device_announce")
+        assert len(wire) == CONTROL_FRAME.size
+        assert wire[0] == CONTROL_CODES["device_announce"] | (CONTROL_MULTICAST if multicast else 0)
+
+        packet = receiver._deserialize_packet(wire)
+        assert packet.packet_type == "device_announce"
+        assert (packet.sender_name, packet.sender_ip) == ("host-a", "192.168.1.10")
+        assert packet.data == {'platform': sender.platform, 'multicast': multicast}
+
+def test_long_name_falls_back_to_json():
+    """Names that do not fit the control frame are sent as JSON and round-trip intact."""
+    long_name = "h" * 80
+    sender, receiver = make_network(long_name), make_network("host-b", "192.168.1.11")
+    sender._multicast_joined = True
+
+    wire = control_bytes(sender, "device_heartbeat")
+    assert wire[:1] == b'{'
+
+    packet = receiver._deserialize_packet(wire)
+    assert packet.packet_type == "device_heartbeat"
+    assert packet.sender_name == long_name
+    assert packet.data['multicast'] is True
+
+def test_own_packets_are_skipped():
+    """Our own looped-back packets are recognised before decoding; peers' are not."""
+    own, peer = make_network(), make_network("host-b", "192.168.1.11")
+    text = ClipboardData("hello", ClipboardType.TEXT, time.time(), "host-a")
+    image = ClipboardData(bytes(1000), ClipboardType.IMAGE, time.time(), "host-a")
+
+    for network in (own, peer):
+        wires = (
+            control_bytes(network, "device_heartbeat"),
+            network._serialize_packet(clipboard_packet(network, text)),
+            network._serialize_packet(clipboard_packet(network, image)),
+        )
+        for wire in wires:
+            assert is_own(own, wire) == (network is own)
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"{name}: ok")
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Round-trip tests for the WebSocket backends' wire formats."""
+
+import sys
+import os
+import time
+import random
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from platforms.simple_websocket_network import SimpleWebSocketNetwork, CLIPBOARD_FRAME
+from platforms.compression import COMPRESS_THRESHOLD, ENCODINGS, zstandard
+from platforms.websocket_network import WebSocketClipboardNetwork
+from platforms.network import FRAME_MAGIC
+from interfaces import ClipboardData, ClipboardType, NetworkPacket
+
+def make_simple_pair():
+    """A sender and a receiver that does not share the sender's identity."""
+    sender, receiver = SimpleWebSocketNetwork(), SimpleWebSocketNetwork()
+    receiver._dev_name_b = b'other-host'
+    return sender, receiver
+
+def frame_round_trip(sender, receiver, data):
+    frame = sender._serialize_frame(data)
+    packet = receiver._deserialize_frame(frame)
+    assert packet.packet_type == "clipboard_data"
+    assert (packet.sender_name, packet.sender_ip) == (sender.device_name, sender.device_ip)
+    return frame, receiver._deserialize_clipboard_data(packet.data)
+
+def test_text_frame_round_trip():
+    sender, receiver = make_simple_pair()
+    data = ClipboardData("你好, world", ClipboardType.TEXT, 1700000000.5, "测试设备")
+
+    frame, decoded = frame_round_trip(sender, receiver, data)
+    assert frame[1] == 0  # Text is never compressed
+    assert decoded == data
+
+def test_small_image_is_sent_raw():
+    sender, receiver = make_simple_pair()
+    data = ClipboardData(bytes(1000), ClipboardType.IMAGE, 1700000000.25, "host-a")
+
+    frame, decoded = frame_round_trip(sender, receiver, data)
+    assert frame[1] == 0
+    assert frame.endswith(data.content)
+    assert decoded == data
+
+def test_large_image_is_compressed():
+    sender, receiver = make_simple_pair()
+    data = ClipboardData(bytes(range(256)) * 1024, ClipboardType.IMAGE, time.time(), "host-a")
+    assert len(data.content) > COMPRESS_THRESHOLD
+
+    frame, decoded = frame_round_trip(sender, receiver, data)
+    assert ENCODINGS[frame[1]] == sender._encoding
+    assert len(frame) < len(data.content)
+    assert decoded == data
+
+def test_zlib_fallback_round_trip():
+    """Peers without zstandard send zlib, which every receiver can decode."""
+    sender, receiver = make_simple_pair()
+    sender._encoding = 'zlib'
+    data = ClipboardData(bytes(200_000), ClipboardType.IMAGE, time.time(), "host-a")
+
+    frame, decoded = frame_round_trip(sender, receiver, data)
+    assert ENCODINGS[frame[1]] == 'zlib'
+    assert decoded == data
+
+def test_incompressible_image_is_sent_raw():
+    sender, receiver = make_simple_pair()
+    payload = random.Random(0).randbytes(COMPRESS_THRESHOLD * 2)
+    data = ClipboardData(payload, ClipboardType.IMAGE, time.time(), "host-a")
+
+    frame, decoded = frame_round_trip(sender, receiver, data)
+    assert frame[1] == 0
+    assert decoded == data
+
+def test_zstd_frame_without_zstandard_is_rejected():
+    if zstandard:
+        return  # Only meaningful where the optional codec is missing
+    sender, receiver = make_simple_pair()
+    data = ClipboardData(bytes(1000), ClipboardType.IMAGE, time.time(), "host-a")
+
+    frame = bytearray(sender._serialize_frame(data))
+    frame[1] = ENCODINGS.index('zstd')
+    packet = receiver._deserialize_frame(bytes(frame))
+    assert receiver._deserialize_clipboard_data(packet.data) is None
+
+def test_own_frame_is_skipped():
+    network = SimpleWebSocketNetwork()
+    data = ClipboardData("hello", ClipboardType.TEXT, time.time(), "host-a")
+    assert network._deserialize_frame(network._serialize_frame(data)) is None
+
+def test_frame_header_layout():
+    sender, _ = make_simple_pair()
+    data = ClipboardData("hi", ClipboardType.TEXT, 1700000000.0, "dev")
+
+    tag, encoding, timestamp, name_len, ip_len, device_len = CLIPBOARD_FRAME.unpack_from(
+        sender._serialize_frame(data)
+    )
+    assert (tag, encoding, timestamp) == (0x01, 0, 1700000000.0)
+    assert (name_len, ip_len, device_len) == (
+        len(sender.device_name.encode('utf-8')), len(sender.device_ip.encode('utf-8')), 3
+    )
+
+def ws_packet(network, data):
+    return NetworkPacket(
+        packet_type="clipboard_data",
+        sender_name=network.device_name,
+        sender_ip=network.device_ip,
+        timestamp=time.time(),
+        data=network._serialize_clipboard_data(data)
+    )
+
+def test_websocket_image_frame_round_trip():
+    """The WebSocket backend sends images in the UDP backend's binary frame layout."""
+    network = WebSocketClipboardNetwork()
+    data = ClipboardData(bytes(range(256)) * 10, ClipboardType.IMAGE, 1700000000.0, "host-a")
+
+    wire = network._serialize_packet(ws_packet(network, data))
+    assert wire[:4] == FRAME_MAGIC
+
+    packet = network._deserialize_packet(wire)
+    assert network._deserialize_clipboard_data(packet.data) == data
+
+def test_websocket_large_text_is_compressed():
+    """Large text goes out compressed in a binary frame and decodes back to str."""
+    network = WebSocketClipboardNetwork()
+    data = ClipboardData("同步 clipboard " * 10000, ClipboardType.TEXT, 1700000000.0, "host-a")
+
+    wire = network._serialize_packet(ws_packet(network, data))
+    assert wire[:4] == FRAME_MAGIC
+    assert ENCODINGS[wire[5]] is not None  # Frame flags name the codec
+    assert len(wire) < len(data.content)
+
+    packet = network._deserialize_packet(wire)
+    assert network._deserialize_clipboard_data(packet.data) == data
+
+def test_websocket_text_round_trip():
+    network = WebSocketClipboardNetwork()
+    data = ClipboardData("héllo", ClipboardType.TEXT, 1700000000.0, "host-a")
+
+    wire = network._serialize_packet(ws_packet(network, data))
+    assert wire[:4] != FRAME_MAGIC
+
+    packet = network._deserialize_packet(wire)
+    assert network._deserialize_clipboard_data(packet.data) == data
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"{name}: ok")